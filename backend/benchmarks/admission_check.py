@@ -0,0 +1,135 @@
+"""Scripted check of overload protection: rate limits and admission control.
+
+    python -m benchmarks.admission_check --rate 5 --burst 10 --max-concurrency 4 --max-wait-ms 200
+
+Checks, through the API, that:
+- a user who exceeds their token bucket gets 429 with Retry-After
+- the bucket gives back one request after 1/rate seconds and a full burst
+  after burst/rate seconds
+- while the search slots are busy, a queued search gets 503 with
+  Retry-After when its wait budget runs out
+- a search that finds the queue full gets 503 immediately
+- single-event reads still go through, and searches succeed again once a
+  slot frees
+
+Busy slots are held directly on a small AdmissionController instead of with
+slow requests, so the outcome doesn't depend on how fast Mongo answers.
+Exits 1 if any check fails.
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+from bson import ObjectId
+
+from . import common  # noqa: F401 (points the app at the benchmark database)
+from .burst import _create_event, _headers
+from src import admission
+from src.admission import AdmissionController, Overloaded, rate_limiter
+from src.config import settings
+from src.db import client, events_collection
+from src.server import app
+
+failures = []
+
+def expect(condition: bool, message: str):
+    print(f"{'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        failures.append(message)
+
+def _retry_after(response: httpx.Response) -> bool:
+    return response.headers.get("Retry-After", "").isdigit()
+
+async def check_rate_limit(http: httpx.AsyncClient, args):
+    rate_limiter.rate, rate_limiter.burst = args.rate, args.burst
+    headers = _headers(str(ObjectId()))
+
+    async def send() -> httpx.Response:
+        return await http.get("/api/events/organized", headers=headers)
+
+    started = time.monotonic()
+    responses = [await send() for _ in range(args.burst + args.overflow)]
+    refilled = int((time.monotonic() - started) * args.rate)
+    allowed = sum(1 for response in responses if response.status_code == 200)
+    limited = [response for response in responses if response.status_code == 429]
+    expect(args.burst <= allowed <= args.burst + refilled,
+           f"{allowed} of {len(responses)} back-to-back requests allowed with a burst of {args.burst}")
+    expect(len(limited) == len(responses) - allowed and all(map(_retry_after, limited)),
+           f"the other {len(limited)} got 429 with Retry-After")
+
+    await asyncio.sleep(1 / args.rate)
+    first, second = await send(), await send()
+    expect((first.status_code, second.status_code) == (200, 429),
+           f"after 1/rate seconds one request is allowed again ({first.status_code}, then {second.status_code})")
+
+    await asyncio.sleep(args.burst / args.rate)
+    responses = [await send() for _ in range(args.burst)]
+    expect(all(response.status_code == 200 for response in responses),
+           f"after burst/rate seconds a full burst of {args.burst} is allowed again")
+
+async def check_admission(http: httpx.AsyncClient, args):
+    rate_limiter.rate = 0
+    settings.admission_control = True
+    controller = admission.admission = AdmissionController(args.max_concurrency, args.queue_size, args.max_wait_ms)
+    organizer = str(ObjectId())
+    eid = await _create_event(http, organizer)
+
+    async def search() -> httpx.Response:
+        return await http.post("/api/events/search", headers=_headers(organizer), json={"keyword": "benchmark"})
+
+    # Occupy every slot the search class may use, as slow searches would
+    held = controller.limit("search")
+    for _ in range(held):
+        await controller.acquire("search")
+
+    started = time.perf_counter()
+    response = await search()
+    waited = (time.perf_counter() - started) * 1000
+    expect(response.status_code == 503 and _retry_after(response),
+           f"queued search gave up after {waited:.0f}ms with {response.status_code} and Retry-After")
+
+    async def queued():
+        try:
+            await controller.acquire("search")
+            controller.release("search")
+        except Overloaded:
+            pass
+
+    waiters = [asyncio.create_task(queued()) for _ in range(args.queue_size)]
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    response = await search()
+    waited = (time.perf_counter() - started) * 1000
+    expect(response.status_code == 503 and _retry_after(response) and waited < args.max_wait_ms / 2,
+           f"search with a full queue rejected in {waited:.0f}ms with {response.status_code} and Retry-After")
+
+    response = await http.get(f"/api/events/{eid}", headers=_headers(organizer))
+    expect(response.status_code == 200, f"single-event read while searches are saturated: {response.status_code}")
+
+    await asyncio.gather(*waiters)
+    for _ in range(held):
+        controller.release("search")
+    response = await search()
+    expect(response.status_code == 200, f"search once the slots are free: {response.status_code}")
+    await events_collection.delete_one({"_id": ObjectId(eid)})
+
+async def main(args) -> int:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        await check_rate_limit(http, args)
+        await check_admission(http, args)
+    client.close()
+    print("FAILED" if failures else "OK")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=5, help="rate limit in requests per second per user")
+    parser.add_argument("--burst", type=int, default=10, help="rate limit bucket size")
+    parser.add_argument("--overflow", type=int, default=5, help="requests sent beyond the burst")
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--queue-size", type=int, default=2)
+    parser.add_argument("--max-wait-ms", type=float, default=200)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,119 @@
+"""Burst benchmark: many users joining and RSVPing to one event at the same time.
+
+    python -m benchmarks.burst --seed-data --operations 2000 --concurrency 200 --output burst.json
+
+Runs the same burst through POST /{event_id}/join and PUT /{event_id}/response
+once per rsvp_write_mode ("direct", then "batched"), each against a freshly
+created event, and reports throughput, latency and Mongo commands per request.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+
+import httpx
+from bson import ObjectId
+
+from . import common
+from .datagen import add_scale_arguments, scale_params, seed_from_args, user_id
+from src.config import settings
+from src.db import client, events_collection
+from src.server import app
+from src.services.user__services import create_access_token
+
+STATUSES = ["Going", "Maybe", "Not Going"]
+
+async def _create_event(http: httpx.AsyncClient, organizer: str) -> str:
+    response = await http.post("/api/events/", headers=_headers(organizer), json={
+        "title": "Burst benchmark", "description": "created by the burst benchmark",
+        "date": "2026-06-01T18:00:00", "location": "Cairo",
+    })
+    return response.json()["event"]["id"]
+
+_tokens = {}
+
+def _headers(uid: str) -> dict:
+    if uid not in _tokens:
+        _tokens[uid] = create_access_token(uid)
+    return {"Authorization": f"Bearer {_tokens[uid]}"}
+
+async def _drive(http: httpx.AsyncClient, operations: list, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    position = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while (index := next(position)) < len(operations):
+            method, url, uid, body = operations[index]
+            start = time.perf_counter()
+            response = await http.request(method, url, headers=_headers(uid), json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    before = common.command_counter.snapshot()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    commands = common.command_counter.snapshot() - before
+
+    result = common.latency_summary(latencies)
+    result.update({
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mongo_commands_per_request": sum(commands.values()) / max(len(latencies), 1),
+        "mongo_commands": dict(commands),
+    })
+    return result
+
+async def run_burst(http: httpx.AsyncClient, mode: str, args, rng: random.Random) -> dict:
+    """Half the operations join, then the same users RSVP"""
+    settings.rsvp_write_mode = mode
+    eid = await _create_event(http, str(user_id(0)))
+    users = [str(user_id(1 + index % (args.users - 1))) for index in range(args.operations // 2)]
+    results = {
+        "join": await _drive(http, [("POST", f"/api/events/{eid}/join", uid, None) for uid in users],
+                             args.concurrency),
+        "response": await _drive(http, [
+            ("PUT", f"/api/events/{eid}/response", uid, {"status": rng.choice(STATUSES)}) for uid in users
+        ], args.concurrency),
+    }
+    await events_collection.delete_one({"_id": ObjectId(eid)})
+    return results
+
+async def main(args):
+    if args.seed_data:
+        await seed_from_args(args)
+
+    rng = random.Random(args.seed)
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        for mode in args.mode or ["direct", "batched"]:
+            for phase, r in (await run_burst(http, mode, args, rng)).items():
+                results[f"{mode} {phase}"] = r
+                print(f"{mode:8s} {phase:9s} p50 {r['p50_ms']:8.2f}ms  p95 {r['p95_ms']:8.2f}ms  p99 {r['p99_ms']:8.2f}ms  "
+                      f"{r['throughput_rps']:8.1f} req/s  {r['mongo_commands_per_request']:6.2f} cmd/req  {r['errors']} errors")
+
+    params = scale_params(args)
+    params.update({
+        "operations": args.operations, "concurrency": args.concurrency,
+        "batch_interval_ms": settings.rsvp_batch_interval_ms, "batch_max_ops": settings.rsvp_batch_max_ops,
+        "participant_storage": settings.participant_storage,
+    })
+    if args.output:
+        common.write_results(args.output, "burst", params, results)
+    client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_scale_arguments(parser)
+    parser.add_argument("--seed-data", action="store_true", help="drop and reseed the benchmark database first")
+    parser.add_argument("--operations", type=int, default=2000, help="joins plus RSVPs in the burst")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--mode", action="append", choices=["direct", "batched"],
+                        help="only run this rsvp_write_mode (repeatable)")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,92 @@
+"""Shared setup for the benchmark scripts.
+
+Importing this module points the app at a dedicated benchmark database before
+any ``src`` module reads its settings, and registers a pymongo command
+listener so every Mongo command issued by the app is counted.
+"""
+import json
+import os
+import platform
+import subprocess
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from pymongo import monitoring
+
+os.environ.setdefault("MONGO_URL", os.environ.get("BENCH_MONGO_URL", "mongodb://localhost:27017"))
+os.environ.setdefault("DB_NAME", "eventplanner_bench")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+if not os.environ["DB_NAME"].endswith("_bench"):
+    # Seeding drops the database; never let that point at real data
+    raise SystemExit("DB_NAME must end with '_bench' when running benchmarks")
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts Mongo commands by name. Motor runs pymongo on threads, hence the lock."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = Counter()
+
+    def started(self, event):
+        with self._lock:
+            self.counts[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def snapshot(self) -> Counter:
+        with self._lock:
+            return Counter(self.counts)
+
+# Registered globally so it applies to the client src.db creates on first use
+command_counter = CommandCounter()
+monitoring.register(command_counter)
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def latency_summary(seconds) -> dict:
+    values = sorted(seconds)
+    return {
+        "count": len(values),
+        "mean_ms": (sum(values) / len(values) * 1000) if values else 0.0,
+        "p50_ms": percentile(values, 50) * 1000,
+        "p95_ms": percentile(values, 95) * 1000,
+        "p99_ms": percentile(values, 99) * 1000,
+    }
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def write_results(path: str, kind: str, params: dict, results: dict):
+    payload = {
+        "kind": kind,
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": params,
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    print(f"Results written to {path}")
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
@@ -0,0 +1,51 @@
+"""Diff two benchmark result files (from load, micro or burst).
+
+    python -m benchmarks.compare baseline.json candidate.json [--threshold 10]
+
+Prints p50/p95/p99 and Mongo command changes per benchmark and exits 1 if any
+p95 regressed by more than the threshold percentage.
+"""
+import argparse
+import json
+import sys
+
+METRICS = ["p50_ms", "p95_ms", "p99_ms", "throughput_rps", "mongo_commands_per_request", "mongo_commands_per_call"]
+
+def _change(old: float, new: float) -> str:
+    if not old:
+        return "   n/a"
+    return f"{(new - old) / old * 100:+6.1f}%"
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed p95 regression in percent")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    if baseline["params"] != candidate["params"]:
+        print("Warning: runs used different parameters, numbers may not be comparable")
+    print(f"baseline  {baseline['commit'][:12]}  {baseline['timestamp']}")
+    print(f"candidate {candidate['commit'][:12]}  {candidate['timestamp']}\n")
+
+    regressed = False
+    for name, new in candidate["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name}: new benchmark")
+            continue
+        print(name)
+        for metric in METRICS:
+            if metric in new and metric in old:
+                print(f"    {metric:28s} {old[metric]:10.2f} -> {new[metric]:10.2f}  {_change(old[metric], new[metric])}")
+        if old.get("p95_ms") and new["p95_ms"] > old["p95_ms"] * (1 + args.threshold / 100):
+            regressed = True
+            print(f"    REGRESSION: p95 above the {args.threshold}% threshold")
+    return 1 if regressed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Deterministic synthetic data for the benchmarks.
+
+    python -m benchmarks.datagen --events 1000000 --users 100000 --hot-participants 10000
+
+The same seed and scale always produce the same users, events and ids, so
+results from different commits are measured against identical data.
+"""
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import bcrypt
+from bson import ObjectId
+
+from . import common  # noqa: F401  (configures the benchmark database)
+from src.db import client, db, events_collection, users_collection
+from src.indexes import ensure_indexes
+
+PASSWORD = "benchmark-password"
+STATUSES = [None, "Going", "Maybe", "Not Going"]
+WORDS = [
+    "party", "meetup", "conference", "workshop", "dinner", "launch", "hackathon", "concert",
+    "retreat", "webinar", "brunch", "festival", "seminar", "reunion", "standup", "demo",
+]
+CITIES = ["Cairo", "Alexandria", "Berlin", "London", "Paris", "Lisbon", "Nairobi", "Tokyo"]
+BASE_DATE = datetime(2026, 1, 1)
+BATCH_SIZE = 5000
+
+def user_id(index: int) -> ObjectId:
+    return ObjectId(f"a0{index:022x}")
+
+def event_id(index: int) -> ObjectId:
+    return ObjectId(f"e0{index:022x}")
+
+def user_email(index: int) -> str:
+    return f"user{index}@bench.example.com"
+
+def generate_users(count: int):
+    # One hash shared by every user keeps seeding fast; bcrypt cost matches the app setting
+    from src.config import settings
+    hashed = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(rounds=settings.bcrypt_rounds)).decode("utf-8")
+    for index in range(count):
+        yield {"_id": user_id(index), "email": user_email(index), "password": hashed, "created_at": None}
+
+def _participant(rng: random.Random, index: int, role: str, store_emails: bool) -> dict:
+    participant = {"user_id": str(user_id(index)), "role": role, "status": rng.choice(STATUSES)}
+    if store_emails:
+        participant["email"] = user_email(index)
+    return participant
+
+def generate_events(rng: random.Random, count: int, users: int, max_participants: int,
+                    hot_events: int, hot_participants: int, store_emails: bool):
+    for index in range(count):
+        organizer = rng.randrange(users)
+        size = hot_participants if index < hot_events else rng.randint(0, max_participants)
+        attendees = rng.sample(range(users), min(size, users))
+        title_words = rng.sample(WORDS, 2)
+        yield {
+            "_id": event_id(index),
+            "title": f"{title_words[0].title()} {title_words[1]} #{index}",
+            "description": " ".join(rng.choice(WORDS) for _ in range(12)),
+            "date": BASE_DATE + timedelta(minutes=rng.randrange(365 * 24 * 60)),
+            "location": rng.choice(CITIES),
+            "organizer_id": str(user_id(organizer)),
+            "participants": [_participant(rng, organizer, "organizer", store_emails)] + [
+                _participant(rng, attendee, "attendee", store_emails)
+                for attendee in attendees if attendee != organizer
+            ],
+        }
+
+async def _insert(collection, documents):
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= BATCH_SIZE:
+            await collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+
+async def seed(events: int, users: int, max_participants: int, hot_events: int,
+               hot_participants: int, seed: int = 42, store_emails: bool = True):
+    """Drop the benchmark database and fill it with a deterministic dataset"""
+    rng = random.Random(seed)
+    await client.drop_database(db.name)
+    await _insert(users_collection, generate_users(users))
+    await _insert(events_collection, generate_events(
+        rng, events, users, max_participants, hot_events, hot_participants, store_emails
+    ))
+    await ensure_indexes()
+
+def add_scale_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--events", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--max-participants", type=int, default=20)
+    parser.add_argument("--hot-events", type=int, default=1, help="events that get --hot-participants attendees")
+    parser.add_argument("--hot-participants", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--legacy-emails", action="store_true",
+                        help="omit stored participant emails, as in events created before they were denormalized")
+
+def scale_params(args) -> dict:
+    return {
+        "events": args.events,
+        "users": args.users,
+        "max_participants": args.max_participants,
+        "hot_events": args.hot_events,
+        "hot_participants": args.hot_participants,
+        "seed": args.seed,
+        "legacy_emails": args.legacy_emails,
+    }
+
+async def seed_from_args(args):
+    params = scale_params(args)
+    print(f"Seeding {db.name}: {params}")
+    await seed(
+        args.events, args.users, args.max_participants, args.hot_events,
+        args.hot_participants, args.seed, not args.legacy_emails
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_scale_arguments(parser)
+    asyncio.run(seed_from_args(parser.parse_args()))
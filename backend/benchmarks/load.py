@@ -0,0 +1,192 @@
+"""Route load test: drives every API route through an in-process ASGI client.
+
+    python -m benchmarks.load --seed-data --requests 500 --concurrency 32 --output load.json
+
+Each route is run on its own at a fixed concurrency, so latency percentiles,
+throughput and Mongo commands per request are attributable to that route.
+Diff two result files with ``python -m benchmarks.compare``.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+
+import httpx
+
+from . import common
+from .datagen import (
+    PASSWORD, WORDS, add_scale_arguments, event_id, scale_params, seed_from_args, user_email, user_id
+)
+from src.db import client, events_collection
+from src.server import app
+from src.services.user__services import create_access_token
+
+SAMPLE_EVENTS = 2000
+
+class Context:
+    """Ids and tokens the request factories draw from"""
+
+    def __init__(self, rng: random.Random, users: int, events: list, hot_events: list):
+        self.rng = rng
+        self.users = users
+        self.events = events  # [(event_id, organizer_id)]
+        self.hot_events = hot_events
+        self.created = []  # event ids returned by the create route, consumed by delete
+        self.counter = itertools.count()
+        self._tokens = {}
+
+    def token(self, uid: str) -> dict:
+        if uid not in self._tokens:
+            self._tokens[uid] = create_access_token(uid)
+        return {"Authorization": f"Bearer {self._tokens[uid]}"}
+
+    def random_user(self) -> int:
+        return self.rng.randrange(self.users)
+
+    def random_event(self):
+        return self.rng.choice(self.events)
+
+def _user_headers(ctx: Context) -> dict:
+    return ctx.token(str(user_id(ctx.random_user())))
+
+# Each factory returns (method, url, kwargs) for one request
+def signup(ctx):
+    return "POST", "/api/auth/signup", {"json": {"email": f"signup{next(ctx.counter)}@bench.example.com", "password": PASSWORD}}
+
+def login(ctx):
+    return "POST", "/api/auth/login", {"json": {"email": user_email(ctx.random_user()), "password": PASSWORD}}
+
+def create(ctx):
+    return "POST", "/api/events/", {"headers": _user_headers(ctx), "json": {
+        "title": f"Bench {ctx.rng.choice(WORDS)}", "description": "created by the load test",
+        "date": "2026-06-01T18:00:00", "location": "Cairo",
+    }}
+
+def organized(ctx):
+    return "GET", "/api/events/organized", {"headers": _user_headers(ctx), "params": {"limit": 50}}
+
+def invited(ctx):
+    return "GET", "/api/events/invited", {"headers": _user_headers(ctx), "params": {"limit": 50}}
+
+def get_event(ctx):
+    eid, _ = ctx.random_event()
+    return "GET", f"/api/events/{eid}", {"headers": _user_headers(ctx)}
+
+def get_hot_event(ctx):
+    return "GET", f"/api/events/{ctx.rng.choice(ctx.hot_events)}", {"headers": _user_headers(ctx)}
+
+def invite(ctx):
+    eid, organizer_id = ctx.random_event()
+    return "POST", f"/api/events/{eid}/invite", {
+        "headers": ctx.token(organizer_id), "json": {"email": user_email(ctx.random_user())}
+    }
+
+def join(ctx):
+    eid, _ = ctx.random_event()
+    return "POST", f"/api/events/{eid}/join", {"headers": _user_headers(ctx)}
+
+def respond(ctx):
+    eid, organizer_id = ctx.random_event()
+    # The organizer is always a participant, so the RSVP always applies
+    return "PUT", f"/api/events/{eid}/response", {
+        "headers": ctx.token(organizer_id), "json": {"status": ctx.rng.choice(["Going", "Maybe", "Not Going"])}
+    }
+
+def search(ctx):
+    return "POST", "/api/events/search", {"headers": _user_headers(ctx), "json": {"keyword": ctx.rng.choice(WORDS), "mode": "text", "limit": 50}}
+
+def search_regex(ctx):
+    return "POST", "/api/events/search", {"headers": _user_headers(ctx), "json": {"keyword": ctx.rng.choice(WORDS), "mode": "regex", "limit": 50}}
+
+def delete(ctx):
+    eid, organizer_id = ctx.created.pop() if ctx.created else ctx.random_event()
+    return "DELETE", f"/api/events/{eid}", {"headers": ctx.token(organizer_id)}
+
+# Order matters: delete consumes the events created earlier in the run
+ROUTES = [
+    ("POST /api/auth/signup", signup),
+    ("POST /api/auth/login", login),
+    ("POST /api/events/", create),
+    ("GET /api/events/organized", organized),
+    ("GET /api/events/invited", invited),
+    ("GET /api/events/{event_id}", get_event),
+    ("GET /api/events/{event_id} (hot)", get_hot_event),
+    ("POST /api/events/{event_id}/invite", invite),
+    ("POST /api/events/{event_id}/join", join),
+    ("PUT /api/events/{event_id}/response", respond),
+    ("POST /api/events/search", search),
+    ("POST /api/events/search (regex)", search_regex),
+    ("DELETE /api/events/{event_id}", delete),
+]
+
+async def run_route(http: httpx.AsyncClient, ctx: Context, name: str, factory, requests: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    remaining = itertools.count()
+
+    async def worker():
+        nonlocal errors
+        while next(remaining) < requests:
+            method, url, kwargs = factory(ctx)
+            start = time.perf_counter()
+            response = await http.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+            elif name == "POST /api/events/":
+                event = response.json()["event"]
+                ctx.created.append((event["id"], event["organizer_id"]))
+
+    before = common.command_counter.snapshot()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    commands = common.command_counter.snapshot() - before
+
+    result = common.latency_summary(latencies)
+    result.update({
+        "errors": errors,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "mongo_commands_per_request": sum(commands.values()) / max(len(latencies), 1),
+        "mongo_commands": dict(commands),
+    })
+    return result
+
+async def main(args):
+    if args.seed_data:
+        await seed_from_args(args)
+
+    events = [
+        (str(doc["_id"]), doc["organizer_id"])
+        async for doc in events_collection.find({}, {"organizer_id": 1}).limit(SAMPLE_EVENTS)
+    ]
+    hot_events = [str(event_id(index)) for index in range(max(args.hot_events, 1))]
+    ctx = Context(random.Random(args.seed), args.users, events, hot_events)
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        for name, factory in ROUTES:
+            if args.route and not any(fragment in name for fragment in args.route):
+                continue
+            results[name] = await run_route(http, ctx, name, factory, args.requests, args.concurrency)
+            r = results[name]
+            print(f"{name:42s} p50 {r['p50_ms']:8.2f}ms  p95 {r['p95_ms']:8.2f}ms  p99 {r['p99_ms']:8.2f}ms  "
+                  f"{r['throughput_rps']:8.1f} req/s  {r['mongo_commands_per_request']:6.2f} cmd/req  {r['errors']} errors")
+
+    params = scale_params(args)
+    params.update({"requests": args.requests, "concurrency": args.concurrency})
+    if args.output:
+        common.write_results(args.output, "load", params, results)
+    client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_scale_arguments(parser)
+    parser.add_argument("--seed-data", action="store_true", help="drop and reseed the benchmark database first")
+    parser.add_argument("--requests", type=int, default=500, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--route", action="append", help="only run routes whose name contains this (repeatable)")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,104 @@
+"""Micro-benchmarks for the hot paths behind the event routes.
+
+    python -m benchmarks.micro --seed-data --output micro.json
+
+Covers EventOut construction from a raw Mongo document, enrich_event_with_emails
+(with stored and with missing participant emails), uncached enriched reads in
+both enrichment modes ("python" and "lookup") and search_events.
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+
+from bson import ObjectId
+
+from . import common
+from .datagen import WORDS, add_scale_arguments, scale_params, seed_from_args, user_email, user_id
+from src.db import client, events_collection
+from src.models.Event_model import EventOut
+from src.services.event_services import enrich_event_with_emails, read_enriched_event, search_events
+
+def _raw_event(participants: int, store_emails: bool) -> dict:
+    return {
+        "_id": "e00000000000000000000000",
+        "title": "Micro benchmark",
+        "description": "x" * 200,
+        "date": datetime(2026, 1, 1),
+        "location": "Cairo",
+        "organizer_id": str(user_id(0)),
+        "participants": [
+            {"user_id": str(user_id(i)), "role": "organizer" if i == 0 else "attendee", "status": "Going",
+             **({"email": user_email(i)} if store_emails else {})}
+            for i in range(participants)
+        ],
+    }
+
+async def _measure(fn, iterations: int) -> dict:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = fn()
+        if asyncio.iscoroutine(result):
+            await result
+        samples.append(time.perf_counter() - start)
+    return common.latency_summary(samples)
+
+async def main(args):
+    if args.seed_data:
+        await seed_from_args(args)
+
+    rng = random.Random(args.seed)
+    participants = min(args.participants, args.users)
+    stored = _raw_event(participants, store_emails=True)
+    legacy = _raw_event(participants, store_emails=False)
+    stored_event = EventOut.model_validate(stored)
+    legacy_event = EventOut.model_validate(legacy)
+    # Stored under a throwaway id so the enriched read benchmarks hit Mongo for real
+    legacy_id = ObjectId()
+    await events_collection.insert_one({**legacy, "_id": legacy_id})
+
+    benchmarks = {
+        f"EventOut.model_validate ({participants} participants)": lambda: EventOut.model_validate(stored),
+        f"enrich_event_with_emails stored ({participants} participants)": lambda: enrich_event_with_emails(stored_event),
+        f"enrich_event_with_emails missing ({participants} participants)": lambda: enrich_event_with_emails(legacy_event),
+        f"read_enriched_event python missing ({participants} participants)":
+            lambda: read_enriched_event(str(legacy_id), mode="python"),
+        f"read_enriched_event lookup missing ({participants} participants)":
+            lambda: read_enriched_event(str(legacy_id), mode="lookup"),
+        "search_events text": lambda: search_events(str(user_id(0)), keyword=rng.choice(WORDS), mode="text", limit=50),
+        "search_events regex": lambda: search_events(str(user_id(0)), keyword=rng.choice(WORDS), mode="regex", limit=50),
+        "search_events date range": lambda: search_events(
+            str(user_id(0)), start_date=datetime(2026, 3, 1), end_date=datetime(2026, 3, 8), limit=50
+        ),
+    }
+
+    results = {}
+    for name, fn in benchmarks.items():
+        if args.only and not any(fragment in name for fragment in args.only):
+            continue
+        before = common.command_counter.snapshot()
+        results[name] = await _measure(fn, args.iterations)
+        commands = common.command_counter.snapshot() - before
+        results[name]["mongo_commands_per_call"] = sum(commands.values()) / args.iterations
+        r = results[name]
+        print(f"{name:60s} mean {r['mean_ms']:8.3f}ms  p50 {r['p50_ms']:8.3f}ms  p99 {r['p99_ms']:8.3f}ms  "
+              f"{r['mongo_commands_per_call']:5.2f} cmd/call")
+
+    await events_collection.delete_one({"_id": legacy_id})
+    params = scale_params(args)
+    params.update({"iterations": args.iterations, "participants": participants})
+    if args.output:
+        common.write_results(args.output, "micro", params, results)
+    client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_scale_arguments(parser)
+    parser.add_argument("--seed-data", action="store_true", help="drop and reseed the benchmark database first")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--participants", type=int, default=1000, help="participants on the synthetic event")
+    parser.add_argument("--only", action="append", help="only run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,127 @@
+"""Consistency check: concurrent joins and RSVPs end in the same state in every rsvp_write_mode.
+
+    python -m benchmarks.rsvp_check --seed-data --users-per-event 300 --responses 3 --concurrency 100
+
+Every user joins one fresh event twice at once, then sends a few RSVPs one
+after the other while all the other users do the same. This runs once per
+rsvp_write_mode with the same plan. The check fails with exit status 1 if
+any of these hold:
+- a request errored
+- a user's stored status isn't the last one they sent
+- the event's counters differ from a recount of its participants
+- the two modes end in different states
+"""
+import argparse
+import asyncio
+import random
+import sys
+
+import httpx
+from bson import ObjectId
+
+from . import common
+from .burst import STATUSES, _create_event, _headers
+from .datagen import add_scale_arguments, seed_from_args, user_id
+from src.config import settings
+from src.db import client, events_collection, participants_collection
+from src.server import app
+from src.services.counters import count_participants
+
+COUNTER_FIELDS = ["participant_count", "role_counts", "status_counts"]
+
+def make_plan(args, rng: random.Random) -> dict:
+    """user id -> the statuses that user sends, in order"""
+    count = min(args.users_per_event, args.users - 1)
+    return {str(user_id(1 + index)): [rng.choice(STATUSES) for _ in range(args.responses)]
+            for index in range(count)}
+
+async def _stored_state(eid: str) -> tuple:
+    event = await events_collection.find_one({"_id": ObjectId(eid)})
+    if settings.participant_storage == "collection":
+        participants = await participants_collection.find({"event_id": ObjectId(eid)}).to_list(None)
+    else:
+        participants = event.get("participants", [])
+    return {field: event.get(field) for field in COUNTER_FIELDS}, participants
+
+async def run_check(http: httpx.AsyncClient, mode: str, plan: dict, concurrency: int) -> dict:
+    settings.rsvp_write_mode = mode
+    eid = await _create_event(http, str(user_id(0)))
+    limit = asyncio.Semaphore(concurrency)
+    errors = []
+
+    async def send(method: str, url: str, uid: str, body=None):
+        async with limit:
+            response = await http.request(method, url, headers=_headers(uid), json=body)
+        if response.status_code >= 400:
+            errors.append(f"{method} {url} as {uid}: {response.status_code} {response.text}")
+
+    async def user(uid: str, statuses: list):
+        # Two joins at once must still add the user only once
+        await asyncio.gather(*(send("POST", f"/api/events/{eid}/join", uid) for _ in range(2)))
+        for status in statuses:
+            await send("PUT", f"/api/events/{eid}/response", uid, {"status": status})
+
+    before = common.command_counter.snapshot()
+    with common.Timer() as timer:
+        await asyncio.gather(*(user(uid, statuses) for uid, statuses in plan.items()))
+    commands = common.command_counter.snapshot() - before
+
+    counters, participants = await _stored_state(eid)
+    await events_collection.delete_one({"_id": ObjectId(eid)})
+    await participants_collection.delete_many({"event_id": ObjectId(eid)})
+
+    statuses = {participant["user_id"]: participant.get("status") for participant in participants}
+    problems = errors[:10]
+    if len(participants) != len(statuses):
+        problems.append(f"{len(participants) - len(statuses)} duplicate participants")
+    for uid, sent in plan.items():
+        if statuses.get(uid) != sent[-1]:
+            problems.append(f"{uid}: stored status {statuses.get(uid)!r}, last sent {sent[-1]!r}")
+    recount = count_participants(participants)
+    if counters != recount:
+        problems.append(f"counters {counters} differ from the recount {recount}")
+    return {
+        "elapsed_s": timer.elapsed,
+        "requests": len(plan) * (2 + len(next(iter(plan.values()), []))),
+        "mongo_commands": sum(commands.values()),
+        "statuses": {uid: status for uid, status in statuses.items() if uid in plan},
+        "counters": counters,
+        "problems": problems,
+    }
+
+async def main(args) -> int:
+    if args.seed_data:
+        await seed_from_args(args)
+
+    plan = make_plan(args, random.Random(args.seed))
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        for mode in ["direct", "batched"]:
+            r = results[mode] = await run_check(http, mode, plan, args.concurrency)
+            print(f"{mode:8s} {r['requests']} requests in {r['elapsed_s']:6.2f}s  {r['mongo_commands']} Mongo commands  "
+                  f"{len(r['problems'])} problems")
+            for problem in r["problems"]:
+                print(f"    {problem}")
+    client.close()
+
+    direct, batched = results["direct"], results["batched"]
+    failed = bool(direct["problems"] or batched["problems"])
+    if direct["counters"] != batched["counters"]:
+        failed = True
+        print(f"counters differ: direct {direct['counters']}, batched {batched['counters']}")
+    differing = [uid for uid in plan if direct["statuses"].get(uid) != batched["statuses"].get(uid)]
+    if differing:
+        failed = True
+        print(f"{len(differing)} users end with a different status per mode, e.g. {differing[:5]}")
+    print(f"{'FAILED' if failed else 'OK'} ({settings.participant_storage} participants)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_scale_arguments(parser)
+    parser.add_argument("--seed-data", action="store_true", help="drop and reseed the benchmark database first")
+    parser.add_argument("--users-per-event", type=int, default=300, help="users joining the event")
+    parser.add_argument("--responses", type=int, default=3, help="RSVPs each user sends in sequence")
+    parser.add_argument("--concurrency", type=int, default=100, help="requests in flight at once")
+    sys.exit(asyncio.run(main(parser.parse_args())))
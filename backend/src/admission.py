@@ -0,0 +1,214 @@
+"""Admission control and per-user rate limits for the API routes.
+
+Every /api request belongs to a route class (cheap reads, listings, writes,
+search). A shared budget of ``admission_max_concurrency`` requests may run at
+once, roughly the Mongo pool size, and each class may only use its own share of
+it. Requests beyond that wait in a bounded per-class queue. When a slot frees,
+the highest-priority class with room goes first, so single-event reads keep
+flowing while searches queue. A request that can't queue, or that waits longer
+than its class budget, gets 503 with Retry-After before it touches Mongo.
+
+Per-user limits are token buckets keyed on the token subject, checked by
+get_current_user_id; exceeding them returns 429 with Retry-After.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, NamedTuple, Optional
+
+from .config import settings
+from .metrics import registry, route_template
+from .serialization import FastJSONResponse
+
+class RouteClass(NamedTuple):
+    priority: int  # Lower is served first
+    share: float  # Fraction of admission_max_concurrency this class may use
+    wait_budget: float  # Fraction of admission_max_wait_ms a request may queue
+
+ROUTE_CLASSES = {
+    "cheap": RouteClass(priority=0, share=1.0, wait_budget=1.0),
+    "default": RouteClass(priority=1, share=1.0, wait_budget=1.0),
+    "list": RouteClass(priority=1, share=0.75, wait_budget=1.0),
+    "write": RouteClass(priority=1, share=0.5, wait_budget=1.0),
+    "search": RouteClass(priority=2, share=0.25, wait_budget=0.5),
+}
+
+# "METHOD template" -> class; other /api routes are "default"
+ROUTES = {
+    "GET /api/events/{event_id}": "cheap",
+    "GET /api/events/{event_id}/stats": "cheap",
+    "GET /api/events/organized": "list",
+    "GET /api/events/invited": "list",
+    "GET /api/events/{event_id}/participants": "list",
+    "POST /api/events/": "write",
+    "PUT /api/events/responses": "write",
+    "DELETE /api/events/{event_id}": "write",
+    "POST /api/events/{event_id}/invite": "write",
+    "POST /api/events/{event_id}/invite/bulk": "write",
+    "POST /api/events/{event_id}/join": "write",
+    "PUT /api/events/{event_id}/response": "write",
+    "POST /api/events/search": "search",
+}
+
+admission_in_flight = registry.gauge("admission_in_flight", "Admitted requests still running", ("route_class",))
+admission_rejected = registry.counter(
+    "admission_rejected_total", "Requests shed by admission control", ("route_class", "reason"))
+admission_wait = registry.histogram(
+    "admission_queue_wait_seconds", "Time admitted requests spent queued", ("route_class",))
+rate_limited = registry.counter("rate_limited_total", "Requests rejected by the per-user rate limit")
+
+class Overloaded(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionController:
+    def __init__(self, max_concurrency: int, queue_size: int, max_wait_ms: float):
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.max_wait = max_wait_ms / 1000
+        self.running = 0
+        self._running: Dict[str, int] = {name: 0 for name in ROUTE_CLASSES}
+        self._waiting: Dict[str, Deque[asyncio.Future]] = {name: deque() for name in ROUTE_CLASSES}
+        self._by_priority = sorted(ROUTE_CLASSES, key=lambda name: ROUTE_CLASSES[name].priority)
+
+    def limit(self, name: str) -> int:
+        return max(1, int(self.max_concurrency * ROUTE_CLASSES[name].share))
+
+    def _has_room(self, name: str) -> bool:
+        return self.running < self.max_concurrency and self._running[name] < self.limit(name)
+
+    def _grant(self, name: str):
+        self.running += 1
+        self._running[name] += 1
+        admission_in_flight.inc(route_class=name)
+
+    def _wake(self):
+        for name in self._by_priority:
+            waiting = self._waiting[name]
+            while waiting and self._has_room(name):
+                self._grant(name)
+                waiting.popleft().set_result(None)
+            if self.running >= self.max_concurrency:
+                return
+
+    async def acquire(self, name: str):
+        waiting = self._waiting[name]
+        if not waiting and self._has_room(name) and not self._higher_priority_waiting(name):
+            self._grant(name)
+            admission_wait.observe(0, route_class=name)
+            return
+        if len(waiting) >= self.queue_size:
+            admission_rejected.inc(route_class=name, reason="queue_full")
+            raise Overloaded("queue_full", self.max_wait)
+        budget = self.max_wait * ROUTE_CLASSES[name].wait_budget
+        future = asyncio.get_running_loop().create_future()
+        waiting.append(future)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), budget)
+        except asyncio.TimeoutError:
+            if future.done():
+                # Granted just as the deadline fired; keep the slot
+                admission_wait.observe(time.perf_counter() - started, route_class=name)
+                return
+            waiting.remove(future)
+            admission_rejected.inc(route_class=name, reason="deadline")
+            raise Overloaded("deadline", budget)
+        except asyncio.CancelledError:
+            # The client went away while queued
+            if future.done():
+                self.release(name)
+            else:
+                waiting.remove(future)
+            raise
+        admission_wait.observe(time.perf_counter() - started, route_class=name)
+
+    def _higher_priority_waiting(self, name: str) -> bool:
+        """Whether a more important class is queued and could use the free slot"""
+        priority = ROUTE_CLASSES[name].priority
+        return any(
+            self._waiting[other] and self._running[other] < self.limit(other)
+            for other in self._by_priority if ROUTE_CLASSES[other].priority < priority
+        )
+
+    def release(self, name: str):
+        self.running -= 1
+        self._running[name] -= 1
+        admission_in_flight.dec(route_class=name)
+        self._wake()
+
+    def snapshot(self) -> dict:
+        return {
+            name: {"running": self._running[name], "queued": len(self._waiting[name]), "limit": self.limit(name)}
+            for name in ROUTE_CLASSES
+        }
+
+admission = AdmissionController(
+    settings.admission_max_concurrency, settings.admission_queue_size, settings.admission_max_wait_ms
+)
+
+class AdmissionMiddleware:
+    """Pure ASGI so streamed bodies keep their slot until the last chunk is sent"""
+
+    def __init__(self, app, router_app=None):
+        self.app = app
+        self.router_app = router_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.admission_control or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+        route = f"{scope['method']} {route_template(self.router_app, scope)}"
+        name = ROUTES.get(route, "default")
+        try:
+            await admission.acquire(name)
+        except Overloaded as e:
+            response = FastJSONResponse({"detail": "Server busy, please retry"}, status_code=503,
+                                        headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))})
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission.release(name)
+
+class RateLimiter:
+    """Token bucket per user: ``rate`` requests per second with bursts up to ``burst``.
+
+    Buckets are kept in an LRU bounded by ``max_users``; an evicted user simply
+    starts again with a full bucket.
+    """
+
+    def __init__(self, rate: float, burst: int, max_users: int = 100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_users = max_users
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def check(self, key: str) -> Optional[float]:
+        """Take one token; returns None if allowed, else the seconds until one is available"""
+        if self.rate <= 0:
+            return None
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = None
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_users:
+            self._buckets.popitem(last=False)
+        return wait
+
+rate_limiter = RateLimiter(settings.rate_limit_per_second, settings.rate_limit_burst)
+
+def check_rate_limit(user_id: str) -> Optional[float]:
+    wait = rate_limiter.check(user_id)
+    if wait is not None:
+        rate_limited.inc()
+    return wait
@@ -0,0 +1,37 @@
+"""ETags for conditional GETs of events and event listings.
+
+Events carry a version that every write bumps, so an ETag can be computed from
+a projected lookup of the version alone; the enriched payload is only built
+when the client's copy is out of date.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+
+from .models.Event_model import EventPage
+
+def event_etag(event_id: str, version: int) -> str:
+    return f'"{event_id}-{version}"'
+
+def page_etag(user_id: str, page: EventPage) -> str:
+    """Covers membership, order and version of every listed event plus the caller,
+    since my_role/my_status make list items caller-specific"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(user_id.encode())
+    for event in page.events:
+        digest.update(f"|{event.id}:{event.version}".encode())
+    digest.update(f"|{page.next_cursor or ''}".encode())
+    return f'"{digest.hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison: W/ prefixes are ignored"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -8,8 +10,93 @@ class Settings(BaseSettings):
     
     mongo_url: str
     db_name: str = "eventplanner"
+    # Mongo connection pool; min_pool_size connections are opened at startup
+    mongo_max_pool_size: int = 100
+    mongo_min_pool_size: int = 10
+    mongo_max_idle_time_ms: Optional[int] = 300000
+    # How long a request waits for a free connection before failing instead of queueing forever
+    mongo_wait_queue_timeout_ms: Optional[int] = 5000
+    mongo_server_selection_timeout_ms: int = 5000
+    # Anything but "primary" can serve reads that lag behind the write that preceded them
+    mongo_read_preference: str = "primary"
+    # Comma separated, e.g. "zstd,zlib"; zstd and snappy need their optional python packages
+    mongo_compressors: str = ""
     jwt_secret: str
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    # Verified bearer tokens kept in memory (0 disables the cache)
+    token_cache_size: int = 10000
+    # bcrypt work factor; existing hashes are upgraded on the next successful login
+    bcrypt_rounds: int = 12
+    # Threads dedicated to bcrypt and how many more requests may wait for one
+    password_hash_workers: int = 4
+    password_hash_queue_size: int = 64
+    # Keyword search backend: "regex" (substring scan, the existing behaviour) or "text" (text
+    # index, whole-word and relevance ranked). Stays "regex" until the two have been compared
+    search_mode: str = "regex"
+    # How participant emails stored on events follow user email changes:
+    # "change_stream" (needs a replica set, falls back to sweeping), "sweep" or "off"
+    email_sync_mode: str = "sweep"
+    email_sync_interval_seconds: int = 3600
+    # How GET /{event_id} fills in missing participant emails: "python" (UserEmailLoader,
+    # a second query) or "lookup" ($lookup on Users inside one aggregation, MongoDB 5.0+)
+    enrichment_mode: str = "python"
+    # Cache of enriched events for GET /{event_id} and post-write reads:
+    # "memory", "off" or "package.module:ClassName" for a shared backend
+    event_cache_backend: str = "memory"
+    event_cache_ttl_seconds: float = 30
+    event_cache_max_entries: int = 10000
+    # Where participants live: "embedded" (array on the event document) or "collection"
+    # (EventParticipants, one document per participant, for very large events).
+    # Run python -m src.migrations.split_participants before switching to "collection"
+    participant_storage: str = "embedded"
+    # Participants included in GET /{event_id} in "collection" mode, and the default
+    # page size of GET /{event_id}/participants
+    participant_page_size: int = 100
+    # Page size of event listings and search when no ?limit is sent, and the upper bound for one
+    default_page_size: int = 50
+    max_page_size: int = 500
+    # Events enriched and written per chunk in NDJSON streaming mode
+    stream_page_size: int = 100
+    # Most emails or RSVPs accepted by one bulk invite/response request
+    max_bulk_items: int = 5000
+    # Requests slower than this are logged with a db/enrich/serialize breakdown
+    # and kept for GET /metrics/slow; the sample rate is in [0, 1] (0 disables)
+    slow_request_threshold_ms: float = 500
+    slow_request_sample_rate: float = 1.0
+    # Joins and RSVPs: "direct" (one update per request) or "batched" (queued per event and
+    # flushed as one write every rsvp_batch_interval_ms or rsvp_batch_max_ops operations,
+    # see services/rsvp_batcher.py for the guarantees)
+    rsvp_write_mode: str = "direct"
+    rsvp_batch_interval_ms: float = 5
+    rsvp_batch_max_ops: int = 500
+    # Admission control for /api routes (see src/admission.py): requests running at once
+    # across all route classes, queued requests per class, and how long one may queue
+    # before getting 503 + Retry-After (search gets half of it)
+    admission_control: bool = True
+    admission_max_concurrency: int = 100
+    admission_queue_size: int = 200
+    admission_max_wait_ms: float = 1000
+    # Per-user token bucket on authenticated event routes (0 disables); over it is 429
+    rate_limit_per_second: float = 20
+    rate_limit_burst: int = 40
+    # Whether the lifespan creates missing indexes; python -m src.serve turns it off
+    # for every worker but the first
+    ensure_indexes_on_startup: bool = True
+    # Production server (python -m src.serve): worker processes (0 = one per CPU), listen
+    # backlog (also capped by net.core.somaxconn), keep-alive (keep it above the load
+    # balancer's idle timeout) and how long SIGTERM waits for in-flight requests
+    server_workers: int = 0
+    server_backlog: int = 2048
+    server_keep_alive_seconds: int = 75
+    server_graceful_timeout_seconds: int = 30
+    # Access logs format a line per request; /metrics already counts them
+    server_access_log: bool = False
+    # Live update fan-out: "local" (this process only) or "package.module:ClassName" for a
+    # broker shared by all workers. Subscribers further behind than live_queue_size deltas
+    # are told to resync instead; live_max_topics caps subscriptions per WebSocket
+    live_broker: str = "local"
+    live_queue_size: int = 256
+    live_max_topics: int = 100
 
 settings = Settings()
\ No newline at end of file
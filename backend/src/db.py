@@ -1,9 +1,116 @@
+import asyncio
+import time
+from typing import List, Optional
+
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
 
 from .config import settings
+from .metrics import mongo_listener, pool_listener
+
+# The client is created by the app lifespan (connect_client) so it binds to the
+# serving event loop and can open its warm-up connections before traffic arrives.
+# Scripts that never call connect_client get one lazily on first use.
+_client: Optional[AsyncIOMotorClient] = None
+
+def _client_options() -> dict:
+    options = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+        "maxIdleTimeMS": settings.mongo_max_idle_time_ms,
+        "waitQueueTimeoutMS": settings.mongo_wait_queue_timeout_ms,
+        "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+        "readPreference": settings.mongo_read_preference,
+        "event_listeners": [mongo_listener, pool_listener],
+    }
+    if settings.mongo_compressors:
+        options["compressors"] = settings.mongo_compressors
+    return options
+
+def get_client() -> AsyncIOMotorClient:
+    global _client
+    if _client is None:
+        _client = AsyncIOMotorClient(settings.mongo_url, **_client_options())
+    return _client
+
+async def connect_client() -> AsyncIOMotorClient:
+    """Create the client and open minPoolSize connections up front.
+
+    Concurrent pings each check out their own connection, so the TCP, TLS and
+    auth handshakes happen here instead of on the first requests after a deploy.
+    """
+    client = get_client()
+    warmup = max(1, settings.mongo_min_pool_size)
+    try:
+        await asyncio.gather(*(client.admin.command("ping") for _ in range(warmup)))
+    except PyMongoError as e:
+        # Start anyway; /health/ready keeps reporting the failure until Mongo is reachable
+        print(f"Mongo warm-up failed: {e}")
+    return client
+
+def close_client():
+    global _client
+    for proxy in _proxies:
+        proxy._resolved = None
+    if _client is not None:
+        _client.close()
+        _client = None
+
+async def ping() -> float:
+    """Round trip of a ping command in milliseconds"""
+    start = time.perf_counter()
+    await get_client().admin.command("ping")
+    return (time.perf_counter() - start) * 1000
+
+# Every proxy, so close_client can drop what they resolved against the old client
+_proxies: List["_LazyProxy"] = []
+
+class _LazyProxy:
+    """Resolves the real Motor object on first use and keeps it until close_client(),
+    so module-level imports of client/db/collections stay valid across
+    connect_client/close_client without building new Motor wrappers on every access."""
+
+    _resolved = None
+
+    def __init__(self):
+        _proxies.append(self)
+
+    def _target(self):
+        raise NotImplementedError
+
+    def _get(self):
+        if self._resolved is None:
+            self._resolved = self._target()
+        return self._resolved
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __getitem__(self, name):
+        return self._get()[name]
+
+class _ClientProxy(_LazyProxy):
+    def _target(self):
+        return get_client()
+
+    def close(self):
+        close_client()
+
+class _DatabaseProxy(_LazyProxy):
+    def _target(self):
+        return get_client()[settings.db_name]
+
+class CollectionProxy(_LazyProxy):
+    def __init__(self, name: str):
+        super().__init__()
+        self._name = name
+
+    def _target(self):
+        return get_client()[settings.db_name][self._name]
 
-client = AsyncIOMotorClient(settings.mongo_url)
-db = client[settings.db_name]
+client = _ClientProxy()
+db = _DatabaseProxy()
 
-users_collection = db['Users']
-events_collection = db['Events']
\ No newline at end of file
+users_collection = CollectionProxy('Users')
+events_collection = CollectionProxy('Events')
+participants_collection = CollectionProxy('EventParticipants')
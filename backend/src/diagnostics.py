@@ -0,0 +1,75 @@
+"""Query-plan diagnostics.
+
+Runs ``explain()`` for every query shape the services issue and exits with a
+non-zero status if any of them is answered with a collection scan::
+
+    python -m src.diagnostics
+"""
+import asyncio
+import sys
+from datetime import datetime
+from typing import Iterator, List, Tuple
+
+from bson import ObjectId
+
+from .db import client, events_collection, participants_collection, users_collection
+from .indexes import ensure_indexes
+from .services.pagination import KEYSET_SORT, keyset_cursor, keyset_filter
+
+_SAMPLE_ID = "000000000000000000000000"
+_SAMPLE_DATE = datetime(2000, 1, 1)
+
+# (name, collection, filter, sort) for each query issued by the service layer
+QUERY_SHAPES = [
+    ("get_events_by_organizer", events_collection, {"organizer_id": _SAMPLE_ID}, KEYSET_SORT),
+    ("get_events_by_participant", events_collection, {"participants.user_id": _SAMPLE_ID}, KEYSET_SORT),
+    ("get_event_by_id", events_collection, {"_id": ObjectId(_SAMPLE_ID)}, None),
+    ("delete_event", events_collection, {"_id": ObjectId(_SAMPLE_ID), "organizer_id": _SAMPLE_ID}, None),
+    ("membership_check", events_collection, {"_id": ObjectId(_SAMPLE_ID), "participants.user_id": _SAMPLE_ID}, None),
+    ("search_events", events_collection, {}, KEYSET_SORT),
+    ("search_events_next_page", events_collection, keyset_filter(keyset_cursor(_SAMPLE_DATE, _SAMPLE_ID)), KEYSET_SORT),
+    ("search_events_by_date", events_collection, {"date": {"$gte": _SAMPLE_DATE, "$lte": _SAMPLE_DATE}}, KEYSET_SORT),
+    ("search_events_by_keyword", events_collection, {"$text": {"$search": "party"}}, None),
+    ("search_events_by_role", events_collection, {"participants.role": "organizer"}, KEYSET_SORT),
+    ("participants_of_event", participants_collection, {"event_id": ObjectId(_SAMPLE_ID)}, [("user_id", 1)]),
+    ("membership_check_separate", participants_collection, {"event_id": ObjectId(_SAMPLE_ID), "user_id": _SAMPLE_ID}, None),
+    ("events_of_participant", participants_collection, {"user_id": _SAMPLE_ID}, None),
+    ("user_by_email", users_collection, {"email": "someone@example.com"}, None),
+    ("users_by_ids", users_collection, {"_id": {"$in": [ObjectId(_SAMPLE_ID)]}}, None),
+]
+
+def _plan_stages(plan) -> Iterator[str]:
+    """Yield every stage name in an explain plan tree (classic and SBE formats)"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for key in ("queryPlan", "inputStage", "inputStages", "shards"):
+            if key in plan:
+                yield from _plan_stages(plan[key])
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+
+async def explain_queries() -> List[Tuple[str, List[str]]]:
+    results = []
+    for name, collection, query, sort in QUERY_SHAPES:
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = await cursor.explain()
+        winning_plan = explanation.get("queryPlanner", {}).get("winningPlan", {})
+        results.append((name, list(_plan_stages(winning_plan))))
+    return results
+
+async def main() -> int:
+    await ensure_indexes()
+    failed = False
+    for name, stages in await explain_queries():
+        scan = "COLLSCAN" in stages
+        failed = failed or scan
+        print(f"{'FAIL' if scan else 'ok  '}  {name}: {' -> '.join(reversed(stages))}")
+    client.close()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
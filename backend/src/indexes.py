@@ -0,0 +1,51 @@
+from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo.errors import PyMongoError
+
+from .db import events_collection, participants_collection, users_collection
+
+# Index definitions are the single source of truth for both the startup bootstrap
+# and the explain() diagnostics. create_indexes is a no-op for indexes that already
+# exist with the same name and spec, so running the bootstrap on every start is safe.
+# Listings are ordered by (date, _id) for keyset pagination, so every listing index
+# ends with those two keys to serve the sort and the resume filter without a SORT stage.
+EVENT_INDEXES = [
+    # get_events_by_organizer, delete_event ownership checks
+    IndexModel([("organizer_id", ASCENDING), ("date", ASCENDING), ("_id", ASCENDING)], name="organizer_id_date_id"),
+    # get_events_by_participant and membership checks (multikey over the participants array)
+    IndexModel([("participants.user_id", ASCENDING), ("date", ASCENDING), ("_id", ASCENDING)], name="participants_user_id_date_id"),
+    # search_events role filter
+    IndexModel([("participants.role", ASCENDING), ("date", ASCENDING), ("_id", ASCENDING)], name="participants_role_date_id"),
+    # search_events date range filter and sort
+    IndexModel([("date", ASCENDING), ("_id", ASCENDING)], name="date_id"),
+    # search_events keyword search in "text" mode; title matches rank above description matches
+    IndexModel(
+        [("title", TEXT), ("description", TEXT)],
+        name="title_description_text",
+        weights={"title": 3, "description": 1},
+    ),
+]
+
+USER_INDEXES = [
+    # signup/login/invite lookups; unique so concurrent signups cannot create duplicates
+    IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+]
+
+# Only queried when participant_storage = "collection"
+PARTICIPANT_INDEXES = [
+    # Membership checks, RSVP updates and the participant listing (paged by user_id);
+    # unique so concurrent joins/invites cannot add someone twice
+    IndexModel([("event_id", ASCENDING), ("user_id", ASCENDING)], name="event_id_user_id", unique=True),
+    # A user's events (covered: only event_id is read) and email propagation
+    IndexModel([("user_id", ASCENDING), ("event_id", ASCENDING)], name="user_id_event_id"),
+]
+
+async def ensure_indexes():
+    """Create every index the service queries rely on. Idempotent."""
+    for collection, indexes in ((events_collection, EVENT_INDEXES), (users_collection, USER_INDEXES),
+                                (participants_collection, PARTICIPANT_INDEXES)):
+        try:
+            await collection.create_indexes(indexes)
+        except PyMongoError as e:
+            # Don't block startup (e.g. duplicate emails prevent the unique index),
+            # but make the failure loud enough to be noticed
+            print(f"Error creating indexes on {collection.name}: {e}")
@@ -0,0 +1,338 @@
+"""Request and Mongo instrumentation, exposed in Prometheus text format at /metrics.
+
+MetricsMiddleware times every request against its route template and keeps a
+per-request RequestStats in a context variable. The pymongo CommandListener
+attached to the Motor client adds each command's duration to that object
+(Motor copies the context into its executor threads), so DB time and command
+counts are attributed to the request that issued them. ``timed("enrich")``
+and ``timed("serialize")`` mark the other phases for slow-request sampling.
+"""
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+from starlette.routing import Match
+
+from .config import settings
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: Tuple, **extra) -> str:
+        return _format_labels({**dict(zip(self.labelnames, key)), **extra})
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._render_samples())
+        return lines
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _render_samples(self):
+        return [f"{self.name}{self._labels(key)} {value}" for key, value in self._values.items()]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_samples(self):
+        lines = []
+        for key, (bucket_counts, total, count) in self._values.items():
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                lines.append(f"{self.name}_bucket{self._labels(key, le=bound)} {bucket_count}")
+            lines.append(f"{self.name}_bucket{self._labels(key, le='+Inf')} {count}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {total}")
+            lines.append(f"{self.name}_count{self._labels(key)} {count}")
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, *args, **kwargs) -> Counter:
+        return self._add(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> Gauge:
+        return self._add(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        return self._add(Histogram(*args, **kwargs))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], List[str]]):
+        """Collectors return already formatted lines, for values owned elsewhere"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+http_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled", ("method", "route"))
+mongo_command_duration = registry.histogram(
+    "mongo_command_duration_seconds", "Mongo command latency", ("command", "collection"))
+mongo_command_failures = registry.counter(
+    "mongo_command_failures_total", "Mongo commands that failed", ("command", "collection"))
+mongo_commands_per_request = registry.histogram(
+    "mongo_commands_per_request", "Mongo commands issued while handling one request",
+    ("method", "route"), buckets=COUNT_BUCKETS)
+
+class RequestStats:
+    """Mutable per-request accumulator shared with Motor's executor threads"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.db_commands = 0
+        self.phases = {"db": 0.0, "enrich": 0.0, "serialize": 0.0}
+
+    def add(self, phase: str, seconds: float, commands: int = 0):
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+            self.db_commands += commands
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+@contextmanager
+def timed(phase: str):
+    """Attribute the time spent in the block to a phase of the current request"""
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add(phase, time.perf_counter() - start)
+
+class MongoCommandListener(monitoring.CommandListener):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections = {}
+
+    def started(self, event):
+        target = event.command.get("collection") if event.command_name == "getMore" else event.command.get(event.command_name)
+        with self._lock:
+            self._collections[(event.connection_id, event.request_id)] = target if isinstance(target, str) else ""
+
+    def _finish(self, event, failed: bool):
+        with self._lock:
+            collection = self._collections.pop((event.connection_id, event.request_id), "")
+        seconds = event.duration_micros / 1_000_000
+        mongo_command_duration.observe(seconds, command=event.command_name, collection=collection)
+        if failed:
+            mongo_command_failures.inc(command=event.command_name, collection=collection)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.add("db", seconds, commands=1)
+
+    def succeeded(self, event):
+        self._finish(event, failed=False)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+mongo_listener = MongoCommandListener()
+
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Connection pool counters for /health/ready and /metrics, summed over all servers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {
+            "connections_open": 0,
+            "checked_out": 0,
+            "checkouts_total": 0,
+            "checkout_failures_total": 0,
+            "checkout_wait_seconds_total": 0.0,
+            "pools_cleared_total": 0,
+        }
+
+    def _add(self, **deltas):
+        with self._lock:
+            for key, delta in deltas.items():
+                self.stats[key] += delta
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+
+    def connection_created(self, event):
+        self._add(connections_open=1)
+
+    def connection_closed(self, event):
+        self._add(connections_open=-1)
+
+    def connection_checked_out(self, event):
+        self._add(checked_out=1, checkouts_total=1,
+                  checkout_wait_seconds_total=getattr(event, "duration", 0.0) or 0.0)
+
+    def connection_checked_in(self, event):
+        self._add(checked_out=-1)
+
+    def connection_check_out_failed(self, event):
+        self._add(checkout_failures_total=1)
+
+    def pool_cleared(self, event):
+        self._add(pools_cleared_total=1)
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+pool_listener = PoolStatsListener()
+
+def _pool_metrics():
+    lines = []
+    for name, value in pool_listener.snapshot().items():
+        lines.append(f"# TYPE mongo_pool_{name} {'counter' if name.endswith('_total') else 'gauge'}")
+        lines.append(f"mongo_pool_{name} {value}")
+    return lines
+
+registry.register_collector(_pool_metrics)
+
+# Most recent slow requests, served as JSON by /metrics/slow
+slow_requests = deque(maxlen=100)
+
+def route_template(app, scope) -> str:
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", scope["path"])
+    return "unmatched"
+
+class MetricsMiddleware:
+    """Pure ASGI middleware so streamed bodies are included in the timing"""
+
+    def __init__(self, app, router_app=None):
+        self.app = app
+        self.router_app = router_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(self.router_app, scope)
+        status_code = 500
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_flight.inc(method=method, route=route)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_stats.reset(token)
+            http_in_flight.dec(method=method, route=route)
+            http_requests.inc(method=method, route=route, status=status_code)
+            http_request_duration.observe(elapsed, method=method, route=route)
+            mongo_commands_per_request.observe(stats.db_commands, method=method, route=route)
+            _sample_slow_request(method, route, status_code, elapsed, stats)
+
+def _sample_slow_request(method: str, route: str, status_code: int, elapsed: float, stats: RequestStats):
+    if elapsed * 1000 < settings.slow_request_threshold_ms or random.random() >= settings.slow_request_sample_rate:
+        return
+    # DB commands can overlap, so "other" is a lower bound rather than an exact remainder
+    phases = {phase: round(seconds * 1000, 3) for phase, seconds in stats.phases.items()}
+    phases["other"] = round(max(0.0, elapsed * 1000 - sum(phases.values())), 3)
+    sample = {
+        "time": time.time(),
+        "method": method,
+        "route": route,
+        "status": status_code,
+        "duration_ms": round(elapsed * 1000, 3),
+        "db_commands": stats.db_commands,
+        "phases_ms": phases,
+    }
+    slow_requests.append(sample)
+    print(f"Slow request: {method} {route} {sample['duration_ms']}ms "
+          f"({stats.db_commands} Mongo commands, breakdown {phases})")
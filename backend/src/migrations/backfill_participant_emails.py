@@ -0,0 +1,18 @@
+"""One-off migration: store participant emails on events created before they were denormalized.
+
+    python -m src.migrations.backfill_participant_emails
+
+Safe to re-run; only participant entries whose email is missing or stale are written.
+"""
+import asyncio
+
+from ..db import client
+from ..services.email_sync import sync_all_user_emails
+
+async def main():
+    modified = await sync_all_user_emails()
+    print(f"Backfilled participant emails on {modified} events")
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,20 @@
+"""Recompute the attendance counters of every event from its participants.
+
+    python -m src.migrations.reconcile_counters
+
+Also the backfill for events created before the counters existed. Safe to run
+while serving traffic: an event that is written concurrently is skipped and
+picked up by the next run (run it periodically, e.g. from cron, to repair drift).
+"""
+import asyncio
+
+from ..db import client
+from ..services.counters import reconcile_counters
+
+async def main():
+    fixed = await reconcile_counters()
+    print(f"Reconciled attendance counters on {fixed} events")
+    client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
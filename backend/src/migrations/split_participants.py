@@ -0,0 +1,59 @@
+"""Copy embedded participant arrays into the EventParticipants collection.
+
+    python -m src.migrations.split_participants [--drop-embedded]
+
+Run it before setting participant_storage = "collection". Safe to re-run: rows
+are upserted with $setOnInsert, so participants already written in "collection"
+mode are left alone, and the attendance counters of every event are recomputed
+from the collection. --drop-embedded also removes the arrays from the events afterwards.
+"""
+import argparse
+import asyncio
+
+from pymongo import UpdateOne
+
+from ..db import client, events_collection, participants_collection
+from ..indexes import ensure_indexes
+from ..services.counters import reconcile_counters
+
+BATCH_SIZE = 1000
+
+async def _copy_event(event: dict) -> int:
+    requests = [
+        UpdateOne(
+            {"event_id": event["_id"], "user_id": participant["user_id"]},
+            {"$setOnInsert": {
+                "role": participant.get("role", "attendee"),
+                "status": participant.get("status"),
+                "email": participant.get("email"),
+            }},
+            upsert=True
+        )
+        for participant in event.get("participants", [])
+        if participant.get("user_id")
+    ]
+    for start in range(0, len(requests), BATCH_SIZE):
+        await participants_collection.bulk_write(requests[start:start + BATCH_SIZE], ordered=False)
+    return len(requests)
+
+async def main(drop_embedded: bool):
+    # The unique (event_id, user_id) index makes the upserts idempotent
+    await ensure_indexes()
+    events = copied = 0
+    async for event in events_collection.find({}, {"participants": 1}):
+        copied += await _copy_event(event)
+        if drop_embedded:
+            await events_collection.update_one(
+                {"_id": event["_id"]}, {"$unset": {"participants": ""}, "$inc": {"version": 1}}
+            )
+        events += 1
+    fixed = await reconcile_counters(layout="collection")
+    print(f"Copied {copied} participants of {events} events into EventParticipants, "
+          f"recomputed the counters of {fixed} events")
+    client.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--drop-embedded", action="store_true",
+                        help="remove the participants arrays from the events once copied")
+    asyncio.run(main(parser.parse_args().drop_embedded))
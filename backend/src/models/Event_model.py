@@ -1,24 +1,13 @@
-from pydantic import BaseModel, Field
-from bson import ObjectId
-from typing import List, Optional
+from pydantic import BaseModel
+from typing import Dict, List, Optional
 from datetime import datetime
-
-class PyObjectId(str):
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
-
-    @classmethod
-    def validate(cls, v, field=None):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid objectid")
-        return str(v)
+from .common import MongoIdModel
 
 class EventParticipant(BaseModel):
     user_id: str
     role: str  # "organizer" or "attendee"
     status: Optional[str] = None  # "Going", "Maybe", "Not Going"
-    email: Optional[str] = None  # User email for display
+    email: Optional[str] = None  # User email for display, stored on write and kept in sync by email_sync
 
 class EventIn(BaseModel):
     title: str
@@ -28,19 +17,46 @@ class EventIn(BaseModel):
     organizer_id: str
     participants: List[EventParticipant] = []
 
-class EventOut(EventIn):
-    id: PyObjectId = Field(default_factory=lambda: PyObjectId(""), alias="_id")
-    
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {ObjectId: str}
-    
-    def dict(self, **kwargs):
-        """Override dict to ensure both id and _id are present"""
-        data = super().dict(**kwargs)
-        
-        if "id" in data and "_id" not in data:
-            data["_id"] = data["id"]
-        elif "_id" in data and "id" not in data:
-            data["id"] = data["_id"]
-        return data
\ No newline at end of file
+class EventOut(EventIn, MongoIdModel):
+    version: int = 0  # Bumped by every write, the basis of the event's ETag
+    # Set when participants are stored separately; participants then holds only the
+    # first page (organizer first), the rest comes from GET /{event_id}/participants
+    participant_count: Optional[int] = None
+
+class EventSummary(MongoIdModel):
+    """Lightweight list item: no description, no participants array, no enrichment"""
+    title: str
+    date: datetime
+    location: str
+    organizer_id: str
+    participant_count: int = 0
+    my_role: Optional[str] = None  # The caller's role, None if not a participant
+    my_status: Optional[str] = None  # The caller's RSVP status
+    version: int = 0
+    status_counts: Optional[Dict[str, int]] = None  # going/maybe/not_going/pending/other
+
+class EventStats(BaseModel):
+    """Precomputed attendance counters, see services/counters.py"""
+    event_id: str
+    participant_count: int = 0
+    role_counts: Dict[str, int] = {}
+    status_counts: Dict[str, int] = {}
+
+class ParticipantPage(BaseModel):
+    participants: List[EventParticipant]
+    next_cursor: Optional[str] = None
+
+class FacetBucket(BaseModel):
+    value: Optional[str] = None
+    count: int = 0
+
+class SearchFacets(BaseModel):
+    """Counts over every event matching a search, not just the returned page"""
+    by_month: List[FacetBucket] = []  # "YYYY-MM" of the event date, oldest first
+    by_role: List[FacetBucket] = []  # The caller's role: "organizer", "attendee" or "none"
+    by_location: List[FacetBucket] = []  # Most common locations first
+    by_status: List[FacetBucket] = []  # RSVPs summed from the events' status counters
+
+class EventPage(BaseModel):
+    events: List[EventSummary]
+    next_cursor: Optional[str] = None  # Opaque token for the next page, None on the last one
@@ -0,0 +1,25 @@
+from pydantic import AliasChoices, BaseModel, BeforeValidator, Field, computed_field
+from bson import ObjectId
+from typing import Annotated
+
+def validate_object_id(v) -> str:
+    if not ObjectId.is_valid(v):
+        raise ValueError("Invalid objectid")
+    return str(v)
+
+# Accepts ObjectId or its hex string, always stored as str
+PyObjectId = Annotated[str, BeforeValidator(validate_object_id)]
+
+class MongoIdModel(BaseModel):
+    """Populated from Mongo documents (``_id``) or API payloads (``id``).
+
+    Serialized with by_alias=True (FastAPI's default) the output carries both
+    ``id`` and ``_id`` for frontend compatibility; both are emitted by the
+    compiled pydantic-core serializer, no Python-side dict copying.
+    """
+    id: PyObjectId = Field(default="", validation_alias=AliasChoices("_id", "id"))
+
+    @computed_field(alias="_id")
+    @property
+    def mongo_id(self) -> str:
+        return self.id
@@ -1,14 +1,34 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Header, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from ..schema.Event_schemas import EventCreateSchema, EventInviteSchema, EventResponseSchema, EventSearchSchema
+from ..schema.Event_schemas import (
+    EventCreateSchema, EventInviteSchema, EventResponseSchema, EventSearchSchema,
+    EventBulkInviteSchema, EventBulkResponseSchema
+)
 from ..services.event_services import (
     create_event, get_events_by_organizer, get_events_by_participant, 
     get_event_by_id, delete_event, invite_user_to_event, 
-    update_attendance_status, search_events, join_event
+    update_attendance_status, search_events, join_event,
+    stream_events_by_organizer, stream_events_by_participant, stream_search_events,
+    invite_users_to_event, update_attendance_statuses,
+    get_event_version, get_versions_by_organizer, get_versions_by_participant, get_event_participants,
+    get_event_stats, search_events_with_facets, get_own_entry,
+    OK, NOT_FOUND, FORBIDDEN, ALREADY_MEMBER, USER_NOT_FOUND, INVITED, CONFLICT
 )
-from ..services.user__services import decode_token
+from ..services.pagination import InvalidCursor
+from ..serialization import FastJSONResponse, dumps
+from ..metrics import timed
+from ..conditional import event_etag, page_etag, etag_matches, not_modified
+from ..services.user__services import token_cache
+from ..services.user_loader import UserEmailLoader
+from ..services.live_updates import live_hub, event_topic, user_topic
+from ..services.rsvp_batcher import rsvp_batcher
 from ..db import users_collection
-from typing import List
+from ..config import settings
+from ..admission import check_rate_limit
+import math
+from typing import AsyncIterator, List, Optional
+import asyncio
 
 router = APIRouter(prefix="/api/events")
 security = HTTPBearer()
@@ -17,53 +37,214 @@ security = HTTPBearer()
 async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     token = credentials.credentials
     try:
-        payload = decode_token(token)
-        user_id = payload.get("sub")
+        # Signature and claims are only verified the first time a token is seen
+        user_id = token_cache.get_subject(token)
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token")
-        return user_id
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
+    retry_after = check_rate_limit(user_id)
+    if retry_after is not None:
+        raise HTTPException(status_code=429, detail="Too many requests",
+                            headers={"Retry-After": str(max(1, math.ceil(retry_after)))})
+    return user_id
+
+# One loader per request: FastAPI caches dependencies for the lifetime of a request,
+# so every service call made while handling it shares the same memoized emails
+async def get_email_loader() -> UserEmailLoader:
+    return UserEmailLoader()
+
+def ndjson_response(pages: AsyncIterator) -> StreamingResponse:
+    """Write event summaries as newline-delimited JSON while the service is still iterating the cursor.
+    
+    If the stream was cut short by a limit, the last line is {"next_cursor": ...}.
+    """
+    async def body():
+        async for page in pages:
+            with timed("serialize"):
+                chunk = b"".join(dumps(event) + b"\n" for event in page.events)
+            yield chunk
+            if page.next_cursor:
+                yield dumps({"next_cursor": page.next_cursor}) + b"\n"
+    return StreamingResponse(body(), media_type="application/x-ndjson")
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_new_event(event: EventCreateSchema, user_id: str = Depends(get_current_user_id)):
+async def create_new_event(event: EventCreateSchema, user_id: str = Depends(get_current_user_id),
+                           loader: UserEmailLoader = Depends(get_email_loader)):
     try:
-        new_event = await create_event(event, user_id)
-        return {"event": new_event, "message": "Event created successfully"}
+        new_event = await create_event(event, user_id, loader)
+        return FastJSONResponse({"event": new_event, "message": "Event created successfully"}, status_code=status.HTTP_201_CREATED)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.put("/responses")
+async def update_responses(payload: EventBulkResponseSchema, user_id: str = Depends(get_current_user_id)):
+    """RSVP to many events at once; each item reports "ok", "not_found" (no such event or not a
+    participant) or "conflict" (raced another change of the same RSVP, safe to resend)"""
+    if len(payload.responses) > settings.max_bulk_items:
+        raise HTTPException(status_code=400, detail=f"At most {settings.max_bulk_items} responses per request")
+    try:
+        result = await update_attendance_statuses(user_id, [item.model_dump() for item in payload.responses])
+        updated = sum(1 for item in result.items if item["outcome"] == OK)
+        return FastJSONResponse({"results": result.items, "updated": updated, "message": "Responses updated"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.websocket("/live")
+async def live_updates(websocket: WebSocket, token: str = Query(...)):
+    """Push channel for live event updates.
+
+    Browsers can't set headers on a WebSocket, so the bearer token comes as ?token=.
+    The client sends {"action": "subscribe" | "unsubscribe", "event_id": ...} to watch
+    an event, or {"action": ..., "topic": "invitations"} for its own invitations, and
+    receives deltas as JSON text frames. {"type": "resync"} means some were dropped
+    because the client fell behind and it should re-read what it shows.
+    """
+    try:
+        user_id = token_cache.get_subject(token)
+    except Exception:
+        user_id = None
+    if not user_id:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+    await live_hub.start()
+    subscription = live_hub.subscription()
+
+    async def forward():
+        while True:
+            await websocket.send_text(await subscription.get())
+
+    async def receive():
+        while True:
+            message = await websocket.receive_json()
+            action = message.get("action") if isinstance(message, dict) else None
+            if action not in ("subscribe", "unsubscribe"):
+                await websocket.send_json({"type": "error", "detail": "Unknown action"})
+                continue
+            if message.get("topic") == "invitations":
+                topic, reply = user_topic(user_id), {"topic": "invitations"}
+            else:
+                event_id = str(message.get("event_id", ""))
+                # The version lets the client tell whether its copy is already stale
+                version = await get_event_version(event_id) if action == "subscribe" else None
+                if action == "subscribe" and version is None:
+                    await websocket.send_json({"type": "error", "detail": "Event not found", "event_id": event_id})
+                    continue
+                topic, reply = event_topic(event_id), {"event_id": event_id, "version": version}
+            if action == "unsubscribe":
+                subscription.unsubscribe(topic)
+            elif topic in subscription.topics or len(subscription.topics) < settings.live_max_topics:
+                subscription.subscribe(topic)
+            else:
+                await websocket.send_json({"type": "error", "detail": f"At most {settings.live_max_topics} subscriptions"})
+                continue
+            await websocket.send_json({"type": f"{action}d", **reply})
+
+    tasks = [asyncio.create_task(forward()), asyncio.create_task(receive())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if not isinstance(task.exception(), (WebSocketDisconnect, RuntimeError, ValueError)):
+                task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        subscription.close()
+
 @router.get("/organized")
-async def get_organized_events(user_id: str = Depends(get_current_user_id)):
+async def get_organized_events(limit: Optional[int] = Query(None, ge=1), cursor: Optional[str] = None,
+                               stream: bool = False, user_id: str = Depends(get_current_user_id),
+                               if_none_match: Optional[str] = Header(None)):
     try:
-        events = await get_events_by_organizer(user_id)
-        return {"events": events}
+        if stream:
+            return ndjson_response(stream_events_by_organizer(user_id, limit, cursor))
+        if if_none_match:
+            etag = page_etag(user_id, await get_versions_by_organizer(user_id, limit, cursor))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+        page = await get_events_by_organizer(user_id, limit, cursor)
+        return FastJSONResponse({"events": page.events, "next_cursor": page.next_cursor},
+                                headers={"ETag": page_etag(user_id, page)})
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/invited")
-async def get_invited_events(user_id: str = Depends(get_current_user_id)):
+async def get_invited_events(limit: Optional[int] = Query(None, ge=1), cursor: Optional[str] = None,
+                             stream: bool = False, user_id: str = Depends(get_current_user_id),
+                             if_none_match: Optional[str] = Header(None)):
     try:
-        events = await get_events_by_participant(user_id)
-        return {"events": events}
+        if stream:
+            return ndjson_response(stream_events_by_participant(user_id, limit, cursor))
+        if if_none_match:
+            etag = page_etag(user_id, await get_versions_by_participant(user_id, limit, cursor))
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+        page = await get_events_by_participant(user_id, limit, cursor)
+        return FastJSONResponse({"events": page.events, "next_cursor": page.next_cursor},
+                                headers={"ETag": page_etag(user_id, page)})
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{event_id}")
-async def get_single_event(event_id: str, user_id: str = Depends(get_current_user_id)):
+async def get_single_event(event_id: str, user_id: str = Depends(get_current_user_id),
+                           loader: UserEmailLoader = Depends(get_email_loader),
+                           if_none_match: Optional[str] = Header(None)):
+    """The event plus the caller's own my_role/my_status, which the participants list may not include"""
     try:
-        event = await get_event_by_id(event_id)
+        if if_none_match:
+            # Only the version is read; the enriched event is built when it changed
+            version = await get_event_version(event_id)
+            if version is not None and etag_matches(if_none_match, event_etag(event_id, version)):
+                return not_modified(event_etag(event_id, version))
+        event = await get_event_by_id(event_id, loader)
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
         
         # Allow public viewing - users can see event details even if not participants
         # This enables search functionality where users can discover and join events
-        return {"event": event}
+        # Joins and RSVPs bump the version, so the ETag also covers my_role/my_status
+        return FastJSONResponse({"event": event, **await get_own_entry(event, user_id)},
+                                headers={"ETag": event_etag(event_id, event.version)})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{event_id}/stats")
+async def event_stats(event_id: str, user_id: str = Depends(get_current_user_id)):
+    """Participant counts per role and per RSVP status, without loading the participants"""
+    try:
+        stats = await get_event_stats(event_id)
+        if stats is None:
+            raise HTTPException(status_code=404, detail="Event not found")
+        return FastJSONResponse(stats)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/{event_id}/participants")
+async def list_participants(event_id: str, limit: Optional[int] = Query(None, ge=1), cursor: Optional[str] = None,
+                            user_id: str = Depends(get_current_user_id),
+                            loader: UserEmailLoader = Depends(get_email_loader)):
+    """Page through an event's participants; large events only embed the first page"""
+    try:
+        page = await get_event_participants(event_id, limit, cursor, loader)
+        if page is None:
+            raise HTTPException(status_code=404, detail="Event not found")
+        return FastJSONResponse({"participants": page.participants, "next_cursor": page.next_cursor})
+    except HTTPException:
+        raise
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.delete("/{event_id}")
 async def delete_existing_event(event_id: str, user_id: str = Depends(get_current_user_id)):
     try:
@@ -77,52 +258,79 @@ async def delete_existing_event(event_id: str, user_id: str = Depends(get_curren
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/{event_id}/invite")
-async def invite_user(event_id: str, invite_data: EventInviteSchema, user_id: str = Depends(get_current_user_id)):
+async def invite_user(event_id: str, invite_data: EventInviteSchema, user_id: str = Depends(get_current_user_id),
+                      loader: UserEmailLoader = Depends(get_email_loader)):
     try:
-        # First check if the event exists and user has permission to invite
-        event = await get_event_by_id(event_id)
-        if not event:
+        # Organizer check, membership check and insert happen in one conditional update
+        result = await invite_user_to_event(event_id, invite_data.email, organizer_id=user_id, loader=loader)
+        if result.outcome == NOT_FOUND:
             raise HTTPException(status_code=404, detail="Event not found")
-        
-        # Check if current user is the organizer
-        if event.organizer_id != user_id:
+        if result.outcome == FORBIDDEN:
             raise HTTPException(status_code=403, detail="Only organizers can invite users")
-        
-        updated_event = await invite_user_to_event(event_id, invite_data.email)
-        if not updated_event:
-            raise HTTPException(status_code=400, detail="User not found or already invited")
+        if result.outcome == USER_NOT_FOUND:
+            raise HTTPException(status_code=400, detail="User not found")
+        if result.outcome == ALREADY_MEMBER:
+            raise HTTPException(status_code=400, detail="User already invited")
             
-        return {"event": updated_event, "message": "User invited successfully"}
+        return FastJSONResponse({"event": result.event, "message": "User invited successfully"})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/{event_id}/invite/bulk")
+async def invite_users(event_id: str, invite_data: EventBulkInviteSchema, user_id: str = Depends(get_current_user_id),
+                       loader: UserEmailLoader = Depends(get_email_loader)):
+    """Invite a list of emails; each one reports "invited", "already_member", "unknown" (no such
+    user) or "conflict" (kept racing concurrent joins, safe to resend)"""
+    if len(invite_data.emails) > settings.max_bulk_items:
+        raise HTTPException(status_code=400, detail=f"At most {settings.max_bulk_items} emails per request")
+    try:
+        result = await invite_users_to_event(event_id, invite_data.emails, organizer_id=user_id, loader=loader)
+        if result.outcome == NOT_FOUND:
+            raise HTTPException(status_code=404, detail="Event not found")
+        if result.outcome == FORBIDDEN:
+            raise HTTPException(status_code=403, detail="Only organizers can invite users")
+        invited = sum(1 for item in result.items if item["outcome"] == INVITED)
+        return FastJSONResponse({"event": result.event, "results": result.items, "invited": invited,
+                                 "message": f"Invited {invited} users"})
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/{event_id}/join")
-async def join_event_endpoint(event_id: str, user_id: str = Depends(get_current_user_id)):
+async def join_event_endpoint(event_id: str, user_id: str = Depends(get_current_user_id),
+                              loader: UserEmailLoader = Depends(get_email_loader)):
     """Allow a user to join an event as an attendee"""
     try:
-        event = await get_event_by_id(event_id)
-        if not event:
+        if settings.rsvp_write_mode == "batched":
+            result = await rsvp_batcher.join(event_id, user_id, loader)
+        else:
+            result = await join_event(event_id, user_id, loader)
+        if result.outcome == NOT_FOUND:
             raise HTTPException(status_code=404, detail="Event not found")
         
-        updated_event = await join_event(event_id, user_id)
-        if not updated_event:
-            raise HTTPException(status_code=400, detail="Failed to join event")
-        
-        return {"event": updated_event, "message": "Successfully joined event"}
+        # Joining an event you are already part of is not an error
+        return FastJSONResponse({"event": result.event, "message": "Successfully joined event"})
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.put("/{event_id}/response")
-async def update_response(event_id: str, response: EventResponseSchema, user_id: str = Depends(get_current_user_id)):
+async def update_response(event_id: str, response: EventResponseSchema, user_id: str = Depends(get_current_user_id),
+                          loader: UserEmailLoader = Depends(get_email_loader)):
     try:
-        updated_event = await update_attendance_status(event_id, user_id, response.status)
-        if not updated_event:
+        if settings.rsvp_write_mode == "batched":
+            result = await rsvp_batcher.respond(event_id, user_id, response.status)
+        else:
+            result = await update_attendance_status(event_id, user_id, response.status, loader)
+        if result.outcome == CONFLICT:
+            raise HTTPException(status_code=409, detail="Your response changed at the same time, please retry")
+        if result.outcome != OK:
             raise HTTPException(status_code=404, detail="Event not found or you're not a participant")
-        return {"event": updated_event, "message": "Response updated successfully"}
+        return FastJSONResponse({"event": result.event, "message": "Response updated successfully"})
     except HTTPException:
         raise
     except Exception as e:
@@ -131,13 +339,28 @@ async def update_response(event_id: str, response: EventResponseSchema, user_id:
 @router.post("/search")
 async def search_events_endpoint(search_params: EventSearchSchema, user_id: str = Depends(get_current_user_id)):
     try:
-        events = await search_events(
+        search_args = dict(
             user_id=user_id,
             keyword=search_params.keyword,
             start_date=search_params.start_date,
             end_date=search_params.end_date,
-            role=search_params.role
+            role=search_params.role,
+            mode=search_params.mode,
+            limit=search_params.limit,
+            cursor=search_params.cursor
         )
-        return {"events": events}
+        if search_params.stream:
+            if search_params.facets:
+                raise HTTPException(status_code=400, detail="Facets can't be streamed")
+            return ndjson_response(stream_search_events(**search_args))
+        if search_params.facets:
+            page, facets = await search_events_with_facets(**search_args)
+            return FastJSONResponse({"events": page.events, "next_cursor": page.next_cursor, "facets": facets})
+        page = await search_events(**search_args)
+        return FastJSONResponse({"events": page.events, "next_cursor": page.next_cursor})
+    except HTTPException:
+        raise
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,21 +1,36 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from ..schema.User_schemas import SignupSchema, LoginSchema, Token
 from ..db import users_collection
-from ..services.user__services import hash_password, verify_password, create_access_token
-from motor.motor_asyncio import AsyncIOMotorCollection
-from pydantic import EmailStr
+from ..services.user__services import (
+    password_hasher, password_needs_rehash, PasswordHasherBusy, create_access_token
+)
+from pymongo.errors import DuplicateKeyError
 
 router = APIRouter()
 
+def hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, please retry",
+        headers={"Retry-After": "1"}
+    )
+
 @router.post("/signup", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def signup(user: SignupSchema):
     # check existing
     existing = await users_collection.find_one({"email": user.email})
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed = hash_password(user.password)
+    try:
+        hashed = await password_hasher.hash(user.password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
     doc = {"email": user.email, "password": hashed, "created_at": None}
-    res = await users_collection.insert_one(doc)
+    try:
+        res = await users_collection.insert_one(doc)
+    except DuplicateKeyError:
+        # The unique email index catches signups that raced past the check above
+        raise HTTPException(status_code=400, detail="Email already registered")
     token = create_access_token(str(res.inserted_id))
     return {"access_token": token, "token_type": "bearer"}
 
@@ -24,7 +39,19 @@ async def login(credentials: LoginSchema):
     user = await users_collection.find_one({"email": credentials.email})
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
-    if not verify_password(credentials.password, user["password"]):
+    try:
+        valid = await password_hasher.verify(credentials.password, user["password"])
+    except PasswordHasherBusy:
+        raise hasher_busy()
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    # Transparently upgrade hashes made with an old work factor
+    if password_needs_rehash(user["password"]):
+        try:
+            rehashed = await password_hasher.hash(credentials.password)
+            await users_collection.update_one({"_id": user["_id"]}, {"$set": {"password": rehashed}})
+            password_hasher.metrics["rehashed_total"] += 1
+        except PasswordHasherBusy:
+            pass  # Best effort, the next login will try again
     token = create_access_token(str(user["_id"]))
     return {"access_token": token, "token_type": "bearer"}
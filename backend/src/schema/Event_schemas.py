@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
 from datetime import datetime
 
@@ -11,11 +11,26 @@ class EventCreateSchema(BaseModel):
 class EventInviteSchema(BaseModel):
     email: EmailStr
 
+class EventBulkInviteSchema(BaseModel):
+    emails: List[EmailStr] = Field(..., min_length=1)
+
 class EventResponseSchema(BaseModel):
     status: str  # "Going", "Maybe", "Not Going"
 
+class EventBulkResponseItem(BaseModel):
+    event_id: str
+    status: str
+
+class EventBulkResponseSchema(BaseModel):
+    responses: List[EventBulkResponseItem] = Field(..., min_length=1)
+
 class EventSearchSchema(BaseModel):
     keyword: Optional[str] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
-    role: Optional[str] = None  # "organizer" or "attendee"
\ No newline at end of file
+    role: Optional[str] = None  # "organizer" or "attendee"
+    mode: Optional[str] = None  # "text" or "regex", defaults to settings.search_mode
+    limit: Optional[int] = Field(None, ge=1)  # Page size, defaults to settings.default_page_size
+    cursor: Optional[str] = None  # next_cursor from the previous page
+    stream: bool = False  # Stream results as newline-delimited JSON
+    facets: bool = False  # Also return month/role/location/RSVP counts over all matches
\ No newline at end of file
@@ -0,0 +1,28 @@
+import orjson
+from bson import ObjectId
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from .metrics import timed
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        # Python mode keeps datetimes native for orjson; by_alias adds "_id" next to "id"
+        return obj.model_dump(by_alias=True)
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=_default)
+
+class FastJSONResponse(ORJSONResponse):
+    """orjson response that also understands pydantic models and ObjectIds.
+
+    Returning one of these from a route skips FastAPI's jsonable_encoder pass,
+    so models go from pydantic-core straight to orjson bytes.
+    """
+
+    def render(self, content) -> bytes:
+        with timed("serialize"):
+            return dumps(content)
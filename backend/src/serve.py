@@ -0,0 +1,127 @@
+"""Production launcher: pre-forked uvicorn workers on uvloop and httptools.
+
+    python -m src.serve [--workers N] [--host 0.0.0.0] [--port 8000]
+
+The master imports the application once, binds the listening socket and forks
+the workers. They inherit the imported modules copy-on-write, so a restart pays
+the import cost once instead of once per worker. The master never talks to
+Mongo: every worker creates its own Motor client in the app lifespan, because
+MongoClient is not fork-safe. Worker 0 also does the once-per-deployment work
+(index check, email sync); a replacement for it takes that over.
+
+SIGTERM or SIGINT on the master is forwarded to the workers. Each one stops
+accepting connections, finishes in-flight requests for up to
+server_graceful_timeout_seconds, flushes queued RSVPs and closes its client.
+Workers that die on their own are replaced.
+
+Workers share nothing in memory: with more than one, point live_broker (and
+ideally event_cache_backend) at shared implementations.
+"""
+import argparse
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+
+_started = time.perf_counter()
+
+import uvicorn
+
+from .config import settings
+from .server import app
+
+# Workers that die sooner than this after starting are restarted with a delay, not in a tight loop
+_MIN_UPTIME_SECONDS = 1.0
+
+def _bind(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def _run_worker(index: int, sock: socket.socket):
+    # Undo the master's handlers; uvicorn installs its own graceful ones
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if index != 0:
+        settings.ensure_indexes_on_startup = False
+        settings.email_sync_mode = "off"
+    config = uvicorn.Config(
+        app,
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keep_alive_seconds,
+        timeout_graceful_shutdown=settings.server_graceful_timeout_seconds,
+        access_log=settings.server_access_log,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+def _spawn(index: int, sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(index, sock)
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(code)
+    return pid
+
+def main(args):
+    workers = args.workers or settings.server_workers or os.cpu_count() or 1
+    sock = _bind(args.host, args.port, settings.server_backlog)
+    print(f"Master {os.getpid()}: app imported in {(time.perf_counter() - _started) * 1000:.0f}ms, "
+          f"starting {workers} workers on {args.host}:{args.port}")
+    if workers > 1 and settings.live_broker == "local":
+        print("Warning: live_broker is \"local\", live updates only reach clients of the worker that made the write")
+
+    children = {}  # pid -> (worker index, started at)
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for index in range(workers):
+        children[_spawn(index, sock)] = (index, time.monotonic())
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index, spawned = children.pop(pid, (None, 0.0))
+        if index is None or stopping:
+            continue
+        print(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, restarting it")
+        if time.monotonic() - spawned < _MIN_UPTIME_SECONDS:
+            time.sleep(_MIN_UPTIME_SECONDS)
+        if not stopping:
+            children[_spawn(index, sock)] = (index, time.monotonic())
+    sock.close()
+    print(f"Master {os.getpid()}: all workers stopped")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: server_workers, else CPU count)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    main(parser.parse_args())
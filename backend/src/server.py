@@ -1,17 +1,71 @@
+import time
+
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .routers.user_routers import router
 from .routers.event_routers import router as event_router
-from .db import client  
+from .db import close_client, connect_client, ping
+from .indexes import ensure_indexes
+from .services.user__services import password_hasher, token_cache
+from .services.email_sync import start_email_sync, stop_email_sync
 from .config import settings
+from .serialization import FastJSONResponse
+from .metrics import MetricsMiddleware, pool_listener, registry, slow_requests
+from .admission import AdmissionMiddleware, admission
+from .services.event_cache import event_cache
+from .services.live_updates import live_hub
+from .services.rsvp_batcher import rsvp_batcher
+from fastapi.responses import PlainTextResponse
+from pymongo.errors import PyMongoError
 import os
 
-app = FastAPI(title="EventPlanner - Phase0 (Auth)")
+# Under src.serve the imports happen once in the master, before forking. They stay
+# at module level on purpose: an import deferred to the lifespan or the first
+# request would be paid again by every worker instead of shared copy-on-write
+import_ms = (time.perf_counter() - _import_started) * 1000
+startup_report = {}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    await connect_client()
+    connected = time.perf_counter()
+    # With several workers only the first checks indexes (see src.serve)
+    if settings.ensure_indexes_on_startup:
+        await ensure_indexes()
+    indexed = time.perf_counter()
+    start_email_sync()
+    await live_hub.start()
+    startup_report.update({
+        "pid": os.getpid(),
+        "import_ms": round(import_ms, 1),
+        "mongo_warmup_ms": round((connected - started) * 1000, 1),
+        "indexes_ms": round((indexed - connected) * 1000, 1),
+        "lifespan_ms": round((time.perf_counter() - started) * 1000, 1),
+    })
+    print(f"Startup report: {startup_report}")
+    try:
+        yield
+    finally:
+        # Queued joins/RSVPs are written before the client closes
+        await rsvp_batcher.drain()
+        await live_hub.stop()
+        await stop_email_sync()
+        password_hasher.shutdown()
+        close_client()
+
+app = FastAPI(title="EventPlanner - Phase0 (Auth)", default_response_class=FastJSONResponse, lifespan=lifespan)
 
 # CORS middleware configuration
 # Allow origins from environment variable or default to localhost for development
 cors_origins_str = os.getenv("CORS_ORIGINS", "http://localhost:4200,http://localhost:80,http://localhost")
 cors_origins = [origin.strip() for origin in cors_origins_str.split(",")]
+# Innermost, so shed requests still get CORS headers and show up in the metrics
+app.add_middleware(AdmissionMiddleware, router_app=app)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
@@ -20,6 +74,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Added last so it wraps CORS as well; it matches routes itself to label by template
+app.add_middleware(MetricsMiddleware, router_app=app)
+
 app.include_router(router, prefix="/api/auth")
 app.include_router(event_router)
 
@@ -27,6 +84,34 @@ app.include_router(event_router)
 async def root():
     return {"message": "EventPlanner API — Phase 0 (auth) is running."}
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    client.close()
\ No newline at end of file
+@app.get("/health/ready")
+async def readiness():
+    pool = pool_listener.snapshot()
+    try:
+        ping_ms = await ping()
+    except PyMongoError as e:
+        return FastJSONResponse({"status": "unavailable", "error": str(e), "pool": pool}, status_code=503)
+    return {"status": "ready", "ping_ms": round(ping_ms, 3), "pool": pool, "admission": admission.snapshot(),
+            "startup": startup_report}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/slow")
+async def slow_request_samples():
+    return {"threshold_ms": settings.slow_request_threshold_ms, "requests": list(slow_requests)}
+
+def _component_metrics():
+    lines = []
+    for name, value in password_hasher.metrics.items():
+        lines.append(f"# TYPE password_hasher_{name} {'counter' if name.endswith('_total') else 'gauge'}")
+        lines.append(f"password_hasher_{name} {value}")
+    for prefix, source in (("token_cache", token_cache), ("event_cache", event_cache.backend)):
+        for counter in ("hits", "misses"):
+            if hasattr(source, counter):
+                lines.append(f"# TYPE {prefix}_{counter}_total counter")
+                lines.append(f"{prefix}_{counter}_total {getattr(source, counter)}")
+    return lines
+
+registry.register_collector(_component_metrics)
@@ -0,0 +1,138 @@
+"""Per-event attendance counters stored on the event document.
+
+    participant_count: int
+    role_counts:   {"organizer": n, "attendee": n, "other": n}
+    status_counts: {"going": n, "maybe": n, "not_going": n, "pending": n, "other": n}
+
+Writers keep them current with $inc in the same update that changes the
+participants (or, with separately stored participants, right after it).
+Incrementing fields that don't exist yet would start them from zero, so
+counter writes only match events that have counters (``COUNTED``). Events
+written before the counters existed are seeded with ``seed_counters`` and the
+write is made again.
+RSVP statuses are free-form strings, so they are mapped onto fixed keys before
+being used in a field path. ``reconcile_counters`` recomputes everything from
+the participants themselves and is what ``python -m src.migrations.reconcile_counters``
+runs.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from ..config import settings
+from ..db import events_collection, participants_collection
+
+ROLES = ("organizer", "attendee")
+STATUS_KEYS = {"Going": "going", "Maybe": "maybe", "Not Going": "not_going"}
+PENDING = "pending"  # Participants that have not answered yet
+OTHER = "other"
+
+RECONCILE_BATCH_SIZE = 1000
+
+# Added to the filter of every counter $inc, see seed_counters
+COUNTED = {"status_counts": {"$exists": True}}
+
+def role_key(role: Optional[str]) -> str:
+    return role if role in ROLES else OTHER
+
+def status_key(status: Optional[str]) -> str:
+    if status is None:
+        return PENDING
+    return STATUS_KEYS.get(status, OTHER)
+
+def _count_rows(rows: Iterable[tuple]) -> dict:
+    """Counter fields from (role, status, number of participants) rows"""
+    roles = Counter({role: 0 for role in (*ROLES, OTHER)})
+    statuses = Counter({key: 0 for key in (*STATUS_KEYS.values(), PENDING, OTHER)})
+    total = 0
+    for role, status, n in rows:
+        roles[role_key(role)] += n
+        statuses[status_key(status)] += n
+        total += n
+    return {"participant_count": total, "role_counts": dict(roles), "status_counts": dict(statuses)}
+
+def count_participants(participants: Iterable[dict]) -> dict:
+    """Counter fields for a list of participant documents"""
+    return _count_rows((participant.get("role"), participant.get("status"), 1) for participant in participants)
+
+def added_inc(role: str, count: int = 1) -> dict:
+    """$inc for adding ``count`` participants that have not answered yet"""
+    return {"participant_count": count, f"role_counts.{role_key(role)}": count, f"status_counts.{PENDING}": count}
+
+def transition_inc(old_status: Optional[str], new_status: Optional[str]) -> dict:
+    """$inc moving one participant between status counters (empty if the key doesn't change)"""
+    old, new = status_key(old_status), status_key(new_status)
+    if old == new:
+        return {}
+    return {f"status_counts.{old}": -1, f"status_counts.{new}": 1}
+
+async def _embedded_counts(events: List[dict]) -> Dict[ObjectId, dict]:
+    return {event["_id"]: count_participants(event.get("participants", [])) for event in events}
+
+async def _separate_counts(events: List[dict]) -> Dict[ObjectId, dict]:
+    found = participants_collection.aggregate([
+        {"$match": {"event_id": {"$in": [event["_id"] for event in events]}}},
+        {"$group": {"_id": {"event_id": "$event_id", "role": "$role", "status": "$status"}, "n": {"$sum": 1}}},
+    ])
+    grouped: Dict[ObjectId, List[tuple]] = {event["_id"]: [] for event in events}
+    async for row in found:
+        key = row["_id"]
+        grouped[key["event_id"]].append((key.get("role"), key.get("status"), row["n"]))
+    return {event_id: _count_rows(rows) for event_id, rows in grouped.items()}
+
+async def _reconcile_batch(events: List[dict], separate: bool) -> int:
+    counts = await (_separate_counts(events) if separate else _embedded_counts(events))
+    requests = []
+    for event in events:
+        expected = counts[event["_id"]]
+        if all(event.get(field) == value for field, value in expected.items()):
+            continue
+        # Every counter write also bumps version, so a write that lands after our
+        # read makes this a no-op instead of being overwritten; the next run retries
+        requests.append(UpdateOne(
+            {"_id": event["_id"], "version": event.get("version")},
+            {"$set": expected, "$inc": {"version": 1}}
+        ))
+    if requests:
+        await events_collection.bulk_write(requests, ordered=False)
+    return len(requests)
+
+async def reconcile_counters(event_ids: Optional[List[ObjectId]] = None, layout: Optional[str] = None) -> int:
+    """Recompute the counters of the given events (default: all) from their participants.
+
+    ``layout`` overrides settings.participant_storage, for the split migration.
+    Returns how many events had drifted and were corrected.
+    """
+    separate = (layout or settings.participant_storage) == "collection"
+    projection = {"version": 1, "participant_count": 1, "role_counts": 1, "status_counts": 1}
+    if not separate:
+        projection.update({"participants.role": 1, "participants.status": 1})
+    query = {"_id": {"$in": event_ids}} if event_ids is not None else {}
+
+    fixed = 0
+    batch = []
+    async for event in events_collection.find(query, projection):
+        batch.append(event)
+        if len(batch) >= RECONCILE_BATCH_SIZE:
+            fixed += await _reconcile_batch(batch, separate)
+            batch = []
+    if batch:
+        fixed += await _reconcile_batch(batch, separate)
+    return fixed
+
+async def seed_counters(event_ids: List[ObjectId]) -> List[ObjectId]:
+    """Compute the counters of the given events that were written before they existed.
+
+    Returns the seeded ids. The counts come from the participants as they are
+    now, so a change already stored in EventParticipants is included.
+    """
+    missing = [
+        doc["_id"] async for doc in events_collection.find(
+            {"_id": {"$in": list(event_ids)}, "status_counts": {"$exists": False}}, {"_id": 1}
+        )
+    ]
+    if missing:
+        await reconcile_counters(missing)
+    return missing
@@ -0,0 +1,137 @@
+"""Keeps the participant emails stored on events in sync with the Users collection.
+
+Participant emails are denormalized onto the event documents (or the
+EventParticipants documents, see participant_store) when a participant is
+added. This module propagates later email changes, either by tailing a
+change stream on Users (needs a replica set) or by periodically sweeping
+every user. ``sync_all_user_emails`` is also what the backfill migration runs.
+"""
+import asyncio
+from typing import Dict, Optional
+
+from pymongo import UpdateMany
+from pymongo.errors import PyMongoError
+
+from ..config import settings
+from ..db import events_collection, users_collection
+from .event_cache import event_cache
+from . import participant_store
+
+SWEEP_BATCH_SIZE = 1000
+
+_task: Optional[asyncio.Task] = None
+
+def _propagate_args(user_id: str, email: str):
+    """(filter, update, array_filters) setting the email on this user's stale participant entries"""
+    return (
+        {"participants": {"$elemMatch": {"user_id": user_id, "email": {"$ne": email}}}},
+        {"$set": {"participants.$[p].email": email}, "$inc": {"version": 1}},
+        [{"p.user_id": user_id}]
+    )
+
+async def _propagate_separate(user_emails: Dict[str, str]) -> int:
+    """EventParticipants layout: fix the documents, then bump the versions of their events"""
+    event_ids = await participant_store.event_ids_with_stale_email(user_emails)
+    if not event_ids:
+        return 0
+    await participant_store.set_emails(user_emails)
+    await events_collection.update_many({"_id": {"$in": list(event_ids)}}, {"$inc": {"version": 1}})
+    return len(event_ids)
+
+async def propagate_user_email(user_id: str, email: str) -> int:
+    """Push one user's current email to all their participant entries. Returns events modified."""
+    if participant_store.separate_participants():
+        modified = await _propagate_separate({user_id: email})
+        if modified:
+            await event_cache.clear()
+        return modified
+    query, update, array_filters = _propagate_args(user_id, email)
+    result = await events_collection.update_many(query, update, array_filters=array_filters)
+    if result.modified_count:
+        # Affected ids are unknown here and email changes are rare: drop everything
+        await event_cache.clear()
+    return result.modified_count
+
+async def sync_all_user_emails() -> int:
+    """Sweep every user and fix stale or missing participant emails. Returns events modified."""
+    if participant_store.separate_participants():
+        return await _sync_all_separate()
+    modified = 0
+    batch = []
+    async for user in users_collection.find({}, {"email": 1}):
+        if user.get("email"):
+            query, update, array_filters = _propagate_args(str(user["_id"]), user["email"])
+            batch.append(UpdateMany(query, update, array_filters=array_filters))
+        if len(batch) >= SWEEP_BATCH_SIZE:
+            modified += (await events_collection.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        modified += (await events_collection.bulk_write(batch, ordered=False)).modified_count
+    if modified:
+        await event_cache.clear()
+    return modified
+
+async def _sync_all_separate() -> int:
+    modified = 0
+    batch = {}
+    async for user in users_collection.find({}, {"email": 1}):
+        if user.get("email"):
+            batch[str(user["_id"])] = user["email"]
+        if len(batch) >= SWEEP_BATCH_SIZE:
+            modified += await _propagate_separate(batch)
+            batch = {}
+    if batch:
+        modified += await _propagate_separate(batch)
+    if modified:
+        await event_cache.clear()
+    return modified
+
+async def _watch_user_emails():
+    pipeline = [{"$match": {"operationType": {"$in": ["update", "replace"]}}}]
+    async with users_collection.watch(pipeline, full_document="updateLookup") as stream:
+        async for change in stream:
+            updated = change.get("updateDescription", {}).get("updatedFields", {})
+            if change["operationType"] == "update" and "email" not in updated:
+                continue
+            user = change.get("fullDocument") or {}
+            if user.get("email"):
+                await propagate_user_email(str(user["_id"]), user["email"])
+
+async def _sweep_forever():
+    while True:
+        # Sleep first so restarts don't all sweep at once; the backfill covers the initial state
+        await asyncio.sleep(settings.email_sync_interval_seconds)
+        try:
+            modified = await sync_all_user_emails()
+            if modified:
+                print(f"Email sync: updated participant emails on {modified} events")
+        except PyMongoError as e:
+            print(f"Error in email sync sweep: {e}")
+
+async def _run(mode: str):
+    if mode == "change_stream":
+        try:
+            await _watch_user_emails()
+            return
+        except PyMongoError as e:
+            # Change streams need a replica set; a standalone server falls back to sweeping
+            print(f"Email sync change stream unavailable ({e}), falling back to periodic sweep")
+    await _sweep_forever()
+
+def start_email_sync():
+    global _task
+    mode = settings.email_sync_mode
+    if mode == "off" or _task is not None:
+        return
+    _task = asyncio.create_task(_run(mode))
+
+async def stop_email_sync():
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
@@ -0,0 +1,152 @@
+"""Read-through cache of enriched EventOut objects keyed by event id.
+
+The default backend lives in process memory, bounded by a TTL and an LRU size
+limit. With several workers each one has its own copy and may serve an event
+up to the TTL after another worker changed it; point ``event_cache_backend``
+at a shared implementation (``"package.module:ClassName"``) to avoid that.
+Backends receive EventOut objects and are responsible for serializing them.
+
+Reads never put an older copy over a newer one. A backend must not replace
+an entry with an event of a lower ``version``, which also covers two writes
+storing their post-images out of order. EventCache.read_through additionally
+drops a result when this process wrote the same event while the read was in
+flight, because an invalidation leaves no version to compare against.
+"""
+import importlib
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+from ..config import settings
+from ..models.Event_model import EventOut
+
+class CacheBackend:
+    """Interface for event cache backends. Methods are async so network caches fit."""
+
+    async def get(self, key: str) -> Optional[EventOut]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: EventOut, ttl: float):
+        """Store value unless the entry already holds a higher version"""
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    async def clear(self):
+        raise NotImplementedError
+
+class NullCache(CacheBackend):
+    """Disables caching"""
+
+    async def get(self, key: str) -> Optional[EventOut]:
+        return None
+
+    async def set(self, key: str, value: EventOut, ttl: float):
+        pass
+
+    async def delete(self, key: str):
+        pass
+
+    async def clear(self):
+        pass
+
+class InMemoryCache(CacheBackend):
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+
+    async def get(self, key: str) -> Optional[EventOut]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: EventOut, ttl: float):
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now and entry[1].version > value.version:
+            return
+        self._entries[key] = (now + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    async def clear(self):
+        self._entries.clear()
+
+def _create_backend(spec: str) -> CacheBackend:
+    if spec == "memory":
+        return InMemoryCache(settings.event_cache_max_entries)
+    if spec == "off":
+        return NullCache()
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+class EventCache:
+    """Thin wrapper that applies the configured TTL and keeps the backend swappable"""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._writes = 0  # Bumped by every set/invalidate/clear
+        self._reading: Dict[str, int] = {}  # Event id -> read-throughs in flight
+        self._written: Dict[str, int] = {}  # Event id being read -> _writes at its last write
+
+    async def get(self, event_id: str) -> Optional[EventOut]:
+        return await self.backend.get(event_id)
+
+    async def read_through(self, event_id: str,
+                           load: Callable[[], Awaitable[Optional[EventOut]]]) -> Optional[EventOut]:
+        """Return the cached event, else load() it and cache the result unless a write overtook the load"""
+        cached = await self.backend.get(event_id)
+        if cached:
+            return cached
+        started = self._writes
+        self._reading[event_id] = self._reading.get(event_id, 0) + 1
+        try:
+            event = await load()
+        finally:
+            overtaken = self._written.get(event_id, 0) > started
+            self._reading[event_id] -= 1
+            if not self._reading[event_id]:
+                del self._reading[event_id]
+                self._written.pop(event_id, None)
+        if event is not None and not overtaken:
+            await self.backend.set(event_id, event, settings.event_cache_ttl_seconds)
+        return event
+
+    def _wrote(self, event_id: Optional[str] = None):
+        self._writes += 1
+        keys = list(self._reading) if event_id is None else [event_id]
+        for key in keys:
+            if key in self._reading:
+                self._written[key] = self._writes
+
+    async def set(self, event_id: str, event: EventOut):
+        """Store the post-image of a write"""
+        self._wrote(event_id)
+        await self.backend.set(event_id, event, settings.event_cache_ttl_seconds)
+
+    async def invalidate(self, event_id: str):
+        self._wrote(event_id)
+        await self.backend.delete(event_id)
+
+    async def clear(self):
+        self._wrote()
+        await self.backend.clear()
+
+event_cache = EventCache(_create_backend(settings.event_cache_backend))
+
+def configure_event_cache(backend: CacheBackend):
+    event_cache.backend = backend
@@ -1,129 +1,447 @@
 from ..db import events_collection, users_collection
-from ..models.Event_model import EventIn, EventOut, EventParticipant
+from ..config import settings
+from ..models.Event_model import (
+    EventIn, EventOut, EventPage, EventParticipant, EventStats, EventSummary, FacetBucket, ParticipantPage,
+    SearchFacets
+)
+from .user_loader import UserEmailLoader, UNKNOWN_EMAIL
+from .event_cache import event_cache
+from . import participant_store
+from .counters import (
+    COUNTED, OTHER, PENDING, STATUS_KEYS, added_inc, count_participants, reconcile_counters, seed_counters,
+    status_key, transition_inc
+)
+from .participant_store import separate_participants
+from .live_updates import live_hub, event_topic, user_topic, publish_added, publish_status
+from ..metrics import timed
+from .pagination import KEYSET_SORT, keyset_filter, participant_filter, keyset_cursor, offset_cursor, decode_offset
 from bson import ObjectId
-from typing import List, Dict
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, NamedTuple, Optional, Tuple
 from datetime import datetime
 import re
 
-async def enrich_event_with_emails(event: EventOut) -> EventOut:
+# Mutation outcomes
+OK = "ok"
+NOT_FOUND = "not_found"
+FORBIDDEN = "forbidden"
+ALREADY_MEMBER = "already_member"
+NOT_PARTICIPANT = "not_participant"
+USER_NOT_FOUND = "user_not_found"
+# Per-item outcomes of the bulk endpoints (alongside OK, NOT_FOUND and ALREADY_MEMBER)
+INVITED = "invited"
+UNKNOWN_USER = "unknown"
+CONFLICT = "conflict"  # Lost every retry to concurrent membership changes; safe to resend
+
+class MutationResult(NamedTuple):
+    outcome: str
+    event: Optional[EventOut] = None  # Post-image, or current state when already a member
+
+class BulkResult(NamedTuple):
+    outcome: str  # OK, or NOT_FOUND/FORBIDDEN for the whole request
+    items: List[Dict[str, str]] = []  # One outcome per requested item, in request order
+    event: Optional[EventOut] = None
+
+def _missing_emails(event: EventOut) -> bool:
+    return any(not participant.email for participant in event.participants)
+
+def _apply_emails(event: EventOut, user_emails: Dict[str, str]) -> EventOut:
+    """Fill in participant emails that were not stored on write.
+
+    Uses shallow model copies: only the participants that change are copied and
+    nothing is re-validated.
+    """
+    participants = [
+        participant if participant.email
+        else participant.model_copy(update={"email": user_emails.get(participant.user_id, UNKNOWN_EMAIL)})
+        for participant in event.participants
+    ]
+    return event.model_copy(update={"participants": participants})
+
+async def enrich_event_with_emails(event: EventOut, loader: Optional[UserEmailLoader] = None) -> EventOut:
     """Enrich event participants with their email addresses"""
+    if not event or not event.participants:
+        return event
+    return (await enrich_events_with_emails([event], loader))[0]
+
+async def enrich_events_with_emails(events: List[EventOut], loader: Optional[UserEmailLoader] = None) -> List[EventOut]:
+    """Fill in emails that are not stored on the participants yet.
+
+    Emails are written with each participant, so this only queries Users for
+    events created before that (until the backfill has run); events that are
+    already complete are returned untouched.
+    """
+    missing_ids = [
+        participant.user_id
+        for event in events
+        for participant in event.participants
+        if not participant.email
+    ]
+    if not missing_ids:
+        return events
+    
+    loader = loader or UserEmailLoader()
     try:
-        if not event or not event.participants:
-            return event
-        
-        # Get all unique user IDs and convert to ObjectIds
-        user_object_ids = []
-        user_id_map = {}  # Maps ObjectId back to string user_id
-        
-        for participant in event.participants:
-            if ObjectId.is_valid(participant.user_id):
-                obj_id = ObjectId(participant.user_id)
-                user_object_ids.append(obj_id)
-                user_id_map[str(obj_id)] = participant.user_id
-        
-        # Fetch all users at once using $in query
-        user_emails: Dict[str, str] = {}
-        if user_object_ids:
-            async for user in users_collection.find({"_id": {"$in": user_object_ids}}):
-                user_id_str = str(user["_id"])
-                original_user_id = user_id_map.get(user_id_str, user_id_str)
-                user_emails[original_user_id] = user.get("email", "Unknown")
-        
-        # Enrich participants with emails
-        enriched_participants = []
-        for participant in event.participants:
-            participant_dict = participant.dict()
-            participant_dict["email"] = user_emails.get(participant.user_id, "Unknown")
-            enriched_participants.append(EventParticipant(**participant_dict))
-        
-        # Create new event with enriched participants
-        event_dict = event.dict(by_alias=False)  # Get field names (id) not aliases (_id)
-        event_dict["participants"] = [p.dict() for p in enriched_participants]
-        # Ensure both id and _id are present for frontend compatibility
-        if "id" in event_dict:
-            event_dict["_id"] = event_dict["id"]
-        elif "_id" in event_dict:
-            event_dict["id"] = event_dict["_id"]
-        return EventOut(**event_dict)
+        with timed("enrich"):
+            user_emails = await loader.load_many(missing_ids)
     except Exception as e:
-        # If enrichment fails, return the original event without emails
+        # If enrichment fails, return the original events without emails
         # This ensures the event retrieval doesn't break
-        print(f"Warning: Failed to enrich event with emails: {e}")
-        return event
+        print(f"Warning: Failed to enrich events with emails: {e}")
+        return events
+    
+    enriched = []
+    for event in events:
+        try:
+            enriched.append(_apply_emails(event, user_emails) if _missing_emails(event) else event)
+        except Exception as e:
+            print(f"Warning: Failed to enrich event with emails: {e}")
+            enriched.append(event)
+    return enriched
 
-async def create_event(event_data: dict, user_id: str) -> EventOut:
-    # Add organizer as participant with organizer role
-    participant = EventParticipant(
-        user_id=user_id,
-        role="organizer"
+def _summary_projection(user_id: str) -> dict:
+    """Only what list views render, plus the participant count and the caller's own entry"""
+    if separate_participants():
+        # The caller's entry is attached afterwards by _with_membership
+        return {"title": 1, "date": 1, "location": 1, "organizer_id": 1, "version": 1,
+                "participant_count": 1, "status_counts": 1}
+    participants = {"$ifNull": ["$participants", []]}
+    return {
+        "title": 1,
+        "date": 1,
+        "location": 1,
+        "organizer_id": 1,
+        "version": 1,
+        # Events written before the counters existed fall back to counting the array
+        "participant_count": {"$ifNull": ["$participant_count", {"$size": participants}]},
+        "status_counts": 1,
+        "me": {"$filter": {"input": participants, "as": "p", "cond": {"$eq": ["$$p.user_id", user_id]}}},
+    }
+
+def _to_summary(event: dict) -> EventSummary:
+    me = event.get("me") or [{}]
+    # Trusted, already projected document: skip validation
+    return EventSummary.model_construct(
+        id=str(event["_id"]),
+        title=event["title"],
+        date=event["date"],
+        location=event["location"],
+        organizer_id=event["organizer_id"],
+        participant_count=event.get("participant_count", 0),
+        my_role=me[0].get("role"),
+        my_status=me[0].get("status"),
+        version=event.get("version", 0),
+        status_counts=event.get("status_counts")
     )
-    
-    event_dict = event_data.dict()
-    event_dict["organizer_id"] = user_id
-    event_dict["participants"] = [participant.dict()]
-    
-    result = await events_collection.insert_one(event_dict)
-    event_dict["_id"] = str(result.inserted_id)
-    event_dict["id"] = str(result.inserted_id)  # Also set id for frontend compatibility
-    
-    return EventOut(**event_dict)
 
-async def get_events_by_organizer(user_id: str) -> List[EventOut]:
-    events = []
+async def _iter_summaries(cursor, context: str) -> AsyncIterator[EventSummary]:
+    """Turn projected Mongo documents into EventSummary objects, skipping ones that fail to parse.
+
+    A query the server rejects (such as $text without its index) is raised
+    rather than reported as an empty result.
+    """
     try:
-        cursor = events_collection.find({"organizer_id": user_id})
         async for event in cursor:
             try:
-                event["_id"] = str(event["_id"])
-                event_obj = EventOut(**event)
-                events.append(await enrich_event_with_emails(event_obj))
+                yield _to_summary(event)
             except Exception as e:
-                print(f"Error processing event in get_events_by_organizer: {e}")
+                print(f"Error processing event in {context}: {e}")
                 continue
+    except OperationFailure:
+        raise
     except Exception as e:
-        print(f"Error in get_events_by_organizer: {e}")
-    return events
+        print(f"Error in {context}: {e}")
 
-async def get_events_by_participant(user_id: str) -> List[EventOut]:
+async def _with_membership(user_id: str, page: EventPage) -> EventPage:
+    """Fill my_role/my_status from EventParticipants with one query per page"""
+    if not separate_participants() or not page.events:
+        return page
+    mine = await participant_store.memberships(user_id, [ObjectId(event.id) for event in page.events])
     events = []
-    try:
-        cursor = events_collection.find({"participants.user_id": user_id})
-        async for event in cursor:
-            try:
-                event["_id"] = str(event["_id"])
-                event_obj = EventOut(**event)
-                events.append(await enrich_event_with_emails(event_obj))
-            except Exception as e:
-                print(f"Error processing event in get_events_by_participant: {e}")
-                continue
-    except Exception as e:
-        print(f"Error in get_events_by_participant: {e}")
-    return events
+    for event in page.events:
+        me = mine.get(ObjectId(event.id), {})
+        events.append(event.model_copy(update={"my_role": me.get("role"), "my_status": me.get("status")}))
+    return EventPage(events=events, next_cursor=page.next_cursor)
+
+async def _stream_with_membership(user_id: str, pages: AsyncIterator[EventPage]) -> AsyncIterator[EventPage]:
+    async for page in pages:
+        yield await _with_membership(user_id, page)
+
+def _membership_stream(user_id: str, pages: AsyncIterator[EventPage]) -> AsyncIterator[EventPage]:
+    return _stream_with_membership(user_id, pages) if separate_participants() else pages
+
+async def _participant_query(user_id: str) -> dict:
+    """Filter for the events a user takes part in"""
+    if separate_participants():
+        return {"_id": {"$in": await participant_store.event_ids_for_user(user_id)}}
+    return {"participants.user_id": user_id}
+
+def _find_events(query: dict, projection: dict, sort: list,
+                 limit: Optional[int], cursor: Optional[str]):
+    """Build the Mongo cursor for one page. Returns (motor cursor, offset).
+
+    The default (date, _id) ordering resumes with a keyset range filter; other
+    orderings (text relevance) resume with skip(). One extra document is fetched
+    so callers can tell whether another page exists. Raises InvalidCursor eagerly
+    so routers can answer 400 before any response is written.
+    """
+    offset = 0
+    if cursor and sort == KEYSET_SORT:
+        after = keyset_filter(cursor)
+        query = {"$and": [query, after]} if query else after
+    elif cursor:
+        offset = decode_offset(cursor)
+    
+    found = events_collection.find(query, projection).sort(sort)
+    if offset:
+        found = found.skip(offset)
+    if limit:
+        found = found.limit(limit + 1)
+    return found, offset
+
+def _page_size(limit: Optional[int]) -> int:
+    """Listings are always paged: default_page_size when no limit is given, never above max_page_size"""
+    return min(limit or settings.default_page_size, settings.max_page_size)
+
+def _next_cursor(last: EventSummary, sort: list, offset: int) -> str:
+    if sort == KEYSET_SORT:
+        return keyset_cursor(last.date, last.id)
+    return offset_cursor(offset)
+
+async def _page_events(query: dict, projection: dict, context: str,
+                       limit: Optional[int] = None, cursor: Optional[str] = None,
+                       sort: list = KEYSET_SORT) -> EventPage:
+    """Fetch one page of event summaries"""
+    limit = _page_size(limit)
+    found, offset = _find_events(query, projection, sort, limit, cursor)
+    events = [event async for event in _iter_summaries(found, context)]
+    
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = _next_cursor(events[-1], sort, offset + limit)
+    return EventPage(events=events, next_cursor=next_cursor)
+
+def _stream_events(query: dict, projection: dict, context: str,
+                   limit: Optional[int] = None, cursor: Optional[str] = None,
+                   sort: list = KEYSET_SORT) -> AsyncIterator[EventPage]:
+    """Yield pages of stream_page_size summaries while the Mongo cursor is iterated.
+
+    Unlike _page_events the limit is optional and not capped: without one the
+    whole result set is streamed. When a limit cuts the result short, the last
+    page carries the cursor to resume from.
+    """
+    found, offset = _find_events(query, projection, sort, limit, cursor)
+    return _stream_pages(found.batch_size(settings.stream_page_size), context, limit, sort, offset)
+
+async def _stream_pages(found, context: str, limit: Optional[int], sort: list, offset: int) -> AsyncIterator[EventPage]:
+    page_size = settings.stream_page_size
+    batch: List[EventSummary] = []
+    last = None
+    sent = 0
+    async for event in _iter_summaries(found, context):
+        if limit and sent + len(batch) == limit:
+            # The extra document proves there is more: finish with a resume cursor
+            yield EventPage(events=batch, next_cursor=_next_cursor(batch[-1] if batch else last, sort, offset + limit))
+            return
+        batch.append(event)
+        if len(batch) == page_size:
+            yield EventPage(events=batch)
+            sent += len(batch)
+            last = batch[-1]
+            batch = []
+    if batch:
+        yield EventPage(events=batch)
+
+async def _lookup_email(user_id: str, loader: Optional[UserEmailLoader] = None) -> Optional[str]:
+    """Email to store on a new participant subdocument"""
+    email = await (loader or UserEmailLoader()).load(user_id)
+    return None if email == UNKNOWN_EMAIL else email
+
+async def create_event(event_data: dict, user_id: str, loader: Optional[UserEmailLoader] = None) -> EventOut:
+    # Add organizer as participant with organizer role
+    participant = EventParticipant(
+        user_id=user_id,
+        role="organizer",
+        email=await _lookup_email(user_id, loader)
+    )
+    
+    event_dict = event_data.model_dump()
+    event_dict["organizer_id"] = user_id
+    event_dict["version"] = 1
+    event_dict.update(count_participants([participant.model_dump()]))
+    if separate_participants():
+        result = await events_collection.insert_one(event_dict)
+        await participant_store.insert_participant(result.inserted_id, participant)
+        event_dict["participants"] = [participant.model_dump()]
+    else:
+        event_dict["participants"] = [participant.model_dump()]
+        result = await events_collection.insert_one(event_dict)
+    event_dict["_id"] = result.inserted_id
+    event_obj = EventOut.model_validate(event_dict)
+    await live_hub.publish(user_topic(user_id), {
+        "type": "event_created", "event_id": str(result.inserted_id), "version": 1, "title": event_obj.title,
+    })
+    return event_obj
+
+async def get_events_by_organizer(user_id: str, limit: Optional[int] = None,
+                                  cursor: Optional[str] = None) -> EventPage:
+    page = await _page_events({"organizer_id": user_id}, _summary_projection(user_id),
+                              "get_events_by_organizer", limit, cursor)
+    return await _with_membership(user_id, page)
+
+def stream_events_by_organizer(user_id: str, limit: Optional[int] = None,
+                               cursor: Optional[str] = None) -> AsyncIterator[EventPage]:
+    return _membership_stream(user_id, _stream_events({"organizer_id": user_id}, _summary_projection(user_id),
+                                                      "get_events_by_organizer", limit, cursor))
+
+async def get_events_by_participant(user_id: str, limit: Optional[int] = None,
+                                    cursor: Optional[str] = None) -> EventPage:
+    page = await _page_events(await _participant_query(user_id), _summary_projection(user_id),
+                              "get_events_by_participant", limit, cursor)
+    return await _with_membership(user_id, page)
+
+async def _stream_separate_participant_events(user_id: str, limit: Optional[int],
+                                              cursor: Optional[str]) -> AsyncIterator[EventPage]:
+    pages = _stream_events(await _participant_query(user_id), _summary_projection(user_id),
+                           "get_events_by_participant", limit, cursor)
+    async for page in _stream_with_membership(user_id, pages):
+        yield page
+
+def stream_events_by_participant(user_id: str, limit: Optional[int] = None,
+                                 cursor: Optional[str] = None) -> AsyncIterator[EventPage]:
+    if separate_participants():
+        if cursor:
+            keyset_filter(cursor)  # Raise InvalidCursor before the response starts
+        return _stream_separate_participant_events(user_id, limit, cursor)
+    return _stream_events({"participants.user_id": user_id}, _summary_projection(user_id),
+                          "get_events_by_participant", limit, cursor)
+
+async def _page_versions(query: dict, limit: Optional[int], cursor: Optional[str]) -> EventPage:
+    """The ids and versions of the page _page_events would return, for conditional GETs.
+
+    Same query, ordering and limit, but only _id/date/version are read and
+    nothing is enriched, so answering a 304 costs one narrow index-ordered scan.
+    """
+    limit = _page_size(limit)
+    found, offset = _find_events(query, {"date": 1, "version": 1}, KEYSET_SORT, limit, cursor)
+    events = [
+        EventSummary.model_construct(id=str(doc["_id"]), date=doc["date"], version=doc.get("version", 0))
+        async for doc in found
+    ]
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = _next_cursor(events[-1], KEYSET_SORT, offset + limit)
+    return EventPage(events=events, next_cursor=next_cursor)
+
+async def get_versions_by_organizer(user_id: str, limit: Optional[int] = None,
+                                    cursor: Optional[str] = None) -> EventPage:
+    return await _page_versions({"organizer_id": user_id}, limit, cursor)
 
-async def get_event_by_id(event_id: str) -> EventOut:
+async def get_versions_by_participant(user_id: str, limit: Optional[int] = None,
+                                      cursor: Optional[str] = None) -> EventPage:
+    return await _page_versions(await _participant_query(user_id), limit, cursor)
+
+async def get_event_version(event_id: str) -> Optional[int]:
+    """Current version of an event, None if it doesn't exist"""
     if not ObjectId.is_valid(event_id):
         return None
-    try:
-        event = await events_collection.find_one({"_id": ObjectId(event_id)})
-        if event:
-            event["_id"] = str(event["_id"])
-            event_obj = EventOut(**event)
-            return await enrich_event_with_emails(event_obj)
+    event = await events_collection.find_one({"_id": ObjectId(event_id)}, {"version": 1})
+    return event.get("version", 0) if event else None
+
+async def _enrich_document(event: dict, loader: Optional[UserEmailLoader] = None) -> EventOut:
+    if separate_participants():
+        preview = await participant_store.preview(event["_id"], event.get("organizer_id"))
+        event = {**event, "participants": preview}
+    return await enrich_event_with_emails(EventOut.model_validate(event), loader)
+
+# Leftover embedded arrays (before the migration dropped them) are never read in "collection" mode
+def _event_projection() -> Optional[dict]:
+    return {"participants": 0} if separate_participants() else None
+
+def _lookup_pipeline(match: dict) -> list:
+    """Aggregation that joins the emails missing from participants in Mongo.
+
+    Only participants without a stored email are looked up, by _id through the
+    localField/foreignField form of $lookup, and the joined Users documents are
+    narrowed to their email before being merged back and dropped.
+    """
+    missing_ids = {"$map": {
+        "input": {"$filter": {"input": {"$ifNull": ["$participants", []]}, "as": "p",
+                              "cond": {"$not": [{"$ifNull": ["$$p.email", False]}]}}},
+        "as": "p",
+        "in": {"$convert": {"input": "$$p.user_id", "to": "objectId", "onError": None, "onNull": None}},
+    }}
+    joined_email = {"$let": {
+        "vars": {"user": {"$arrayElemAt": [
+            {"$filter": {"input": "$_users", "as": "u",
+                         "cond": {"$eq": [{"$toString": "$$u._id"}, "$$p.user_id"]}}}, 0
+        ]}},
+        "in": {"$ifNull": ["$$user.email", UNKNOWN_EMAIL]},
+    }}
+    return [
+        {"$match": match},
+        {"$set": {"_missing_ids": missing_ids}},
+        {"$lookup": {"from": users_collection.name, "localField": "_missing_ids", "foreignField": "_id",
+                     "pipeline": [{"$project": {"email": 1}}], "as": "_users"}},
+        {"$set": {"participants": {"$map": {
+            "input": {"$ifNull": ["$participants", []]}, "as": "p",
+            "in": {"$mergeObjects": ["$$p", {"email": {"$ifNull": ["$$p.email", joined_email]}}]},
+        }}}},
+        {"$unset": ["_missing_ids", "_users"]},
+    ]
+
+async def read_enriched_event(event_id: str, loader: Optional[UserEmailLoader] = None,
+                              mode: Optional[str] = None) -> Optional[EventOut]:
+    """Read an event from Mongo (bypassing the cache) with participant emails filled in"""
+    if not ObjectId.is_valid(event_id):
+        return None
+    if (mode or settings.enrichment_mode) == "lookup" and not separate_participants():
+        found = await events_collection.aggregate(_lookup_pipeline({"_id": ObjectId(event_id)})).to_list(length=1)
+        return EventOut.model_validate(found[0]) if found else None
+    event = await events_collection.find_one({"_id": ObjectId(event_id)}, _event_projection())
+    return await _enrich_document(event, loader) if event else None
+
+async def get_event_by_id(event_id: str, loader: Optional[UserEmailLoader] = None) -> EventOut:
+    if not ObjectId.is_valid(event_id):
         return None
+    try:
+        return await event_cache.read_through(event_id, lambda: read_enriched_event(event_id, loader))
     except Exception as e:
         print(f"Error getting event by ID {event_id}: {e}")
         return None
 
+async def get_own_entry(event: EventOut, user_id: str) -> Dict[str, Optional[str]]:
+    """The caller's my_role/my_status in an event.
+
+    Read per request rather than cached with the event: separately stored
+    participants only embed the first page, which may not include the caller.
+    """
+    if separate_participants():
+        mine = await participant_store.memberships(user_id, [ObjectId(event.id)])
+        me = mine.get(ObjectId(event.id), {})
+    else:
+        me = next((p.model_dump() for p in event.participants if p.user_id == user_id), {})
+    return {"my_role": me.get("role"), "my_status": me.get("status")}
+
 async def update_event(event_id: str, event_data: dict) -> EventOut:
     if not ObjectId.is_valid(event_id):
         return None
     result = await events_collection.update_one(
         {"_id": ObjectId(event_id)},
-        {"$set": event_data}
+        {"$set": event_data, "$inc": {"version": 1}}
     )
     
     if result.modified_count > 0:
-        return await get_event_by_id(event_id)
+        await event_cache.invalidate(event_id)
+        event = await get_event_by_id(event_id)
+        await live_hub.publish(event_topic(event_id), {
+            "type": "event_updated", "event_id": event_id, "version": event.version if event else None,
+            "fields": sorted(event_data),
+        })
+        return event
     return None
 
 async def delete_event(event_id: str, user_id: str) -> bool:
@@ -133,101 +451,476 @@ async def delete_event(event_id: str, user_id: str) -> bool:
     event = await events_collection.find_one({
         "_id": ObjectId(event_id),
         "organizer_id": user_id
-    })
+    }, {"_id": 1})
     
     if event:
         result = await events_collection.delete_one({"_id": ObjectId(event_id)})
+        if separate_participants():
+            await participant_store.delete_for_event(ObjectId(event_id))
+        await event_cache.invalidate(event_id)
+        if result.deleted_count > 0:
+            await live_hub.publish(event_topic(event_id), {"type": "event_deleted", "event_id": event_id})
         return result.deleted_count > 0
     return False
 
-async def invite_user_to_event(event_id: str, email: str) -> EventOut:
+async def _explain_no_match(event_id: str, user_id: str, organizer_id: Optional[str] = None,
+                            loader: Optional[UserEmailLoader] = None) -> MutationResult:
+    """Work out why a conditional update matched nothing.
+
+    Only runs on the failure path, so successful mutations stay a single round trip.
+    """
+    event = await events_collection.find_one({"_id": ObjectId(event_id)}, _event_projection())
+    if not event:
+        return MutationResult(NOT_FOUND)
+    if organizer_id is not None and event.get("organizer_id") != organizer_id:
+        return MutationResult(FORBIDDEN)
+    if separate_participants():
+        member = user_id and await participant_store.is_member(event["_id"], user_id)
+    else:
+        member = any(p.get("user_id") == user_id for p in event.get("participants", []))
+    if member:
+        return MutationResult(ALREADY_MEMBER, await _enrich_document(event, loader))
+    return MutationResult(NOT_PARTICIPANT, await _enrich_document(event, loader))
+
+async def _counted_update(event_id: ObjectId, update: Callable[[], Awaitable[Optional[dict]]]) -> Optional[dict]:
+    """Run a find_one_and_update that moves the counters together with the embedded participants.
+
+    The update's filter includes COUNTED. If it matched nothing because the
+    event predates the counters, they are seeded and the update is made once more.
+    """
+    event = await update()
+    if event is None and await seed_counters([event_id]):
+        event = await update()
+    return event
+
+async def inc_separate_counters(event_id: ObjectId, inc: dict) -> Optional[dict]:
+    """$inc the counters and version after a change stored in EventParticipants; returns the post-image.
+
+    An event that predates the counters is seeded instead. Its counts already
+    include the change, so the increment is not applied on top.
+    """
+    event = await events_collection.find_one_and_update(
+        {"_id": event_id, **COUNTED}, {"$inc": {**inc, "version": 1}},
+        projection=_event_projection(), return_document=ReturnDocument.AFTER
+    )
+    if event is None and await seed_counters([event_id]):
+        event = await events_collection.find_one({"_id": event_id}, _event_projection())
+    return event
+
+async def _insert_separate_attendee(event_id: ObjectId, participant: EventParticipant,
+                                   extra_filter: dict) -> Optional[dict]:
+    """Insert into EventParticipants; the unique index rejects existing members"""
+    if not await events_collection.find_one({"_id": event_id, **extra_filter}, {"_id": 1}):
+        return None
+    if not await participant_store.insert_participant(event_id, participant):
+        return None
+    return await inc_separate_counters(event_id, added_inc("attendee"))
+
+async def _add_attendee(event_id: str, user_id: str, email: Optional[str], extra_filter: dict,
+                        loader: Optional[UserEmailLoader]) -> Optional[EventOut]:
+    """Push an attendee unless already a member; returns the enriched post-image or None"""
+    participant = EventParticipant(
+        user_id=user_id,
+        role="attendee",
+        email=email
+    )
+    if separate_participants():
+        event = await _insert_separate_attendee(ObjectId(event_id), participant, extra_filter)
+    else:
+        event = await _counted_update(ObjectId(event_id), lambda: events_collection.find_one_and_update(
+            {"_id": ObjectId(event_id), "participants.user_id": {"$ne": user_id}, **extra_filter, **COUNTED},
+            {"$push": {"participants": participant.model_dump()}, "$inc": {**added_inc("attendee"), "version": 1}},
+            return_document=ReturnDocument.AFTER
+        ))
+    if event:
+        event_obj = await _enrich_document(event, loader)
+        await event_cache.set(event_id, event_obj)
+        return event_obj
+    return None
+
+async def invite_user_to_event(event_id: str, email: str, organizer_id: Optional[str] = None,
+                               loader: Optional[UserEmailLoader] = None) -> MutationResult:
+    """Invite a user by email. When organizer_id is given, only that organizer may invite."""
+    if not ObjectId.is_valid(event_id):
+        return MutationResult(NOT_FOUND)
+    
     # First, find the user by email
-    user = await users_collection.find_one({"email": email})
+    user = await users_collection.find_one({"email": email}, {"_id": 1, "email": 1})
     if not user:
-        return None
+        # Report 404/403 before revealing whether the email is registered
+        result = await _explain_no_match(event_id, "", organizer_id)
+        if result.outcome in (NOT_FOUND, FORBIDDEN):
+            return result
+        return MutationResult(USER_NOT_FOUND)
     
     user_id = str(user["_id"])
-    
-    # Check if user is already invited
+    extra_filter = {"organizer_id": organizer_id} if organizer_id is not None else {}
+    event = await _add_attendee(event_id, user_id, user.get("email"), extra_filter, loader)
+    if event:
+        await publish_added(event, [user_id], "invite")
+        return MutationResult(OK, event)
+    return await _explain_no_match(event_id, user_id, organizer_id, loader)
+
+async def join_event(event_id: str, user_id: str, loader: Optional[UserEmailLoader] = None) -> MutationResult:
+    """Allow a user to join an event as an attendee"""
     if not ObjectId.is_valid(event_id):
-        return None
-    event = await events_collection.find_one({
-        "_id": ObjectId(event_id),
-        "participants.user_id": user_id
-    })
+        return MutationResult(NOT_FOUND)
     
-    if not event:
-        # Add user as attendee
-        participant = EventParticipant(
-            user_id=user_id,
-            role="attendee"
+    event = await _add_attendee(event_id, user_id, await _lookup_email(user_id, loader), {}, loader)
+    if event:
+        await publish_added(event, [user_id], "join")
+        return MutationResult(OK, event)
+    return await _explain_no_match(event_id, user_id, loader=loader)
+
+def _own_entry(user_id: str) -> dict:
+    """Projection returning only the user's own participant entry"""
+    return {"participants": {"$elemMatch": {"user_id": user_id}}}
+
+def _status_key_expression(status) -> dict:
+    """counters.status_key as an aggregation expression"""
+    return {"$switch": {
+        "branches": [{"case": {"$eq": [{"$ifNull": [status, None]}, None]}, "then": PENDING}] + [
+            {"case": {"$eq": [status, value]}, "then": key} for value, key in STATUS_KEYS.items()
+        ],
+        "default": OTHER,
+    }}
+
+def _set_status_pipeline(user_id: str, status: str) -> list:
+    """Update pipeline that sets one embedded RSVP and moves the status counters.
+
+    The replaced status is read on the server inside the same update, so the
+    counter transition always matches it without a read first or a retry.
+    """
+    mine = {"$filter": {"input": "$participants", "as": "p", "cond": {"$eq": ["$$p.user_id", user_id]}}}
+    old_status = {"$let": {"vars": {"me": {"$arrayElemAt": [mine, 0]}}, "in": "$$me.status"}}
+    new_key = status_key(status)
+    return [
+        {"$set": {"_old_key": _status_key_expression(old_status)}},
+        {"$set": {
+            "participants": {"$map": {"input": "$participants", "as": "p", "in": {"$cond": [
+                {"$eq": ["$$p.user_id", user_id]}, {"$mergeObjects": ["$$p", {"status": {"$literal": status}}]}, "$$p"
+            ]}}},
+            "version": {"$add": [{"$ifNull": ["$version", 0]}, 1]},
+            **{
+                f"status_counts.{key}": {"$add": [
+                    {"$ifNull": [f"$status_counts.{key}", 0]},
+                    {"$cond": [{"$eq": ["$_old_key", key]}, -1, 0]},
+                    1 if key == new_key else 0,
+                ]}
+                for key in (*STATUS_KEYS.values(), PENDING, OTHER)
+            },
+        }},
+        {"$unset": "_old_key"},
+    ]
+
+async def _set_embedded_status(event_id: ObjectId, user_id: str, status: str) -> Optional[dict]:
+    """Set an embedded RSVP and move the status counters in one atomic update.
+
+    Returns the post-image, None if the event doesn't exist or the user is not a participant.
+    """
+    return await _counted_update(event_id, lambda: events_collection.find_one_and_update(
+        {"_id": event_id, "participants.user_id": user_id, **COUNTED},
+        _set_status_pipeline(user_id, status),
+        return_document=ReturnDocument.AFTER
+    ))
+
+async def update_attendance_status(event_id: str, user_id: str, status: str,
+                                   loader: Optional[UserEmailLoader] = None) -> MutationResult:
+    if not ObjectId.is_valid(event_id):
+        return MutationResult(NOT_FOUND)
+    if separate_participants():
+        event = None
+        before = await participant_store.set_status(ObjectId(event_id), user_id, status)
+        if before is not None:
+            event = await inc_separate_counters(ObjectId(event_id), transition_inc(before.get("status"), status))
+    else:
+        event = await _set_embedded_status(ObjectId(event_id), user_id, status)
+    if event:
+        event_obj = await _enrich_document(event, loader)
+        await event_cache.set(event_id, event_obj)
+        await publish_status(event_id, user_id, status, event_obj.version)
+        return MutationResult(OK, event_obj)
+    result = await _explain_no_match(event_id, user_id, loader=loader)
+    if result.outcome == ALREADY_MEMBER:
+        # A participant whose update matched nothing raced a concurrent change; safe to resend
+        return MutationResult(CONFLICT, result.event)
+    return result
+
+# Retries when a concurrent join/invite adds one of the users between our read and our update
+_BULK_INVITE_ATTEMPTS = 3
+
+async def invite_users_to_event(event_id: str, emails: List[str], organizer_id: str,
+                                loader: Optional[UserEmailLoader] = None) -> BulkResult:
+    """Invite many users by email with one users query and one $push/$each update.
+
+    Every email gets INVITED, ALREADY_MEMBER or UNKNOWN_USER (CONFLICT if the
+    update lost every retry); duplicate emails in the request are collapsed.
+    """
+    if not ObjectId.is_valid(event_id):
+        return BulkResult(NOT_FOUND)
+    emails = list(dict.fromkeys(emails))
+    event_obj = None
+    invited, pending = set(), set()
+    users = await users_collection.find(
+        {"email": {"$in": emails}}, {"_id": 1, "email": 1}
+    ).to_list(length=None)
+    user_ids = {user["email"]: str(user["_id"]) for user in users}
+    if separate_participants():
+        return await _invite_separate(ObjectId(event_id), emails, user_ids, organizer_id, loader)
+
+    for _ in range(_BULK_INVITE_ATTEMPTS):
+        event = await events_collection.find_one(
+            {"_id": ObjectId(event_id)}, {"organizer_id": 1, "participants.user_id": 1, "status_counts": 1}
         )
-        
-        result = await events_collection.update_one(
-            {"_id": ObjectId(event_id)},
-            {"$push": {"participants": participant.dict()}}
+        if not event:
+            return BulkResult(NOT_FOUND)
+        if event.get("organizer_id") != organizer_id:
+            return BulkResult(FORBIDDEN)
+        if "status_counts" not in event:
+            await seed_counters([event["_id"]])
+
+        members = {p.get("user_id") for p in event.get("participants", [])}
+        new_members = {}
+        for email in emails:
+            user_id = user_ids.get(email)
+            if user_id and user_id not in members and user_id not in new_members:
+                new_members[user_id] = email
+        if not new_members:
+            pending = set()
+            break
+        pending = set(new_members)
+        participants = [
+            EventParticipant(user_id=user_id, role="attendee", email=email).model_dump()
+            for user_id, email in new_members.items()
+        ]
+        # The $nin guard keeps the push atomic: if anyone joined meanwhile, re-read and retry
+        updated = await events_collection.find_one_and_update(
+            {"_id": ObjectId(event_id), "organizer_id": organizer_id,
+             "participants.user_id": {"$nin": list(new_members)}, **COUNTED},
+            {"$push": {"participants": {"$each": participants}},
+             "$inc": {**added_inc("attendee", len(participants)), "version": 1}},
+            return_document=ReturnDocument.AFTER
         )
-        
-        if result.modified_count > 0:
-            return await get_event_by_id(event_id)
-    
-    return None
+        if updated:
+            invited, pending = pending, set()
+            event_obj = await _enrich_document(updated, loader)
+            await event_cache.set(event_id, event_obj)
+            await publish_added(event_obj, list(new_members), "invite")
+            break
 
-async def join_event(event_id: str, user_id: str) -> EventOut:
-    """Allow a user to join an event as an attendee"""
+    if event_obj is None:
+        event_obj = await get_event_by_id(event_id, loader)
+    return BulkResult(OK, _invite_outcomes(emails, user_ids, invited, pending), event_obj)
+
+def _invite_outcomes(emails: List[str], user_ids: Dict[str, str], invited: set, pending: set) -> List[Dict[str, str]]:
+    items = []
+    for email in emails:
+        user_id = user_ids.get(email)
+        if user_id is None:
+            outcome = UNKNOWN_USER
+        elif user_id in invited:
+            outcome = INVITED
+        elif user_id in pending:
+            outcome = CONFLICT
+        else:
+            outcome = ALREADY_MEMBER
+        items.append({"email": email, "outcome": outcome})
+    return items
+
+async def _invite_separate(event_id: ObjectId, emails: List[str], user_ids: Dict[str, str], organizer_id: str,
+                           loader: Optional[UserEmailLoader]) -> BulkResult:
+    """Bulk invite into EventParticipants: one unordered insert_many, duplicates are existing members"""
+    if not await events_collection.find_one({"_id": event_id}, {"_id": 1}):
+        return BulkResult(NOT_FOUND)
+    if not await events_collection.find_one({"_id": event_id, "organizer_id": organizer_id}, {"_id": 1}):
+        return BulkResult(FORBIDDEN)
+    new_members = {}
+    for email in emails:
+        if email in user_ids:
+            new_members.setdefault(user_ids[email], email)
+    invited = await participant_store.insert_participants(event_id, [
+        EventParticipant(user_id=user_id, role="attendee", email=email)
+        for user_id, email in new_members.items()
+    ])
+    if invited:
+        updated = await inc_separate_counters(event_id, added_inc("attendee", len(invited)))
+        event_obj = await _enrich_document(updated, loader)
+        await event_cache.set(str(event_id), event_obj)
+        await publish_added(event_obj, [user_id for user_id in new_members if user_id in invited], "invite")
+    else:
+        event_obj = await get_event_by_id(str(event_id), loader)
+    return BulkResult(OK, _invite_outcomes(emails, user_ids, invited, set()), event_obj)
+
+async def _set_embedded_statuses(user_id: str, statuses: Dict[ObjectId, str]) -> Tuple[set, set]:
+    """Embedded counterpart of participant_store.set_statuses, same return value"""
+    if not statuses:
+        return set(), set()
+    current = await events_collection.find(
+        {"_id": {"$in": list(statuses)}, "participants.user_id": user_id}, {**_own_entry(user_id), "status_counts": 1}
+    ).to_list(length=None)
+    previous = {doc["_id"]: doc["participants"][0].get("status") for doc in current}
+    if not previous:
+        return set(), set()
+    uncounted = [doc["_id"] for doc in current if "status_counts" not in doc]
+    if uncounted:
+        await seed_counters(uncounted)
+    requests = [
+        UpdateOne(
+            {"_id": event_id, "participants": {"$elemMatch": {"user_id": user_id, "status": old}}, **COUNTED},
+            {"$set": {"participants.$.status": statuses[event_id]},
+             "$inc": {**transition_inc(old, statuses[event_id]), "version": 1}}
+        )
+        for event_id, old in previous.items()
+    ]
+    result = await events_collection.bulk_write(requests, ordered=False)
+    if result.matched_count == len(requests):
+        return set(previous), set(previous)
+    # bulk_write only reports totals, so look up which ones now carry the new status
+    cursor = events_collection.find(
+        {"_id": {"$in": list(previous)}, "participants.user_id": user_id}, _own_entry(user_id)
+    )
+    applied = {doc["_id"] async for doc in cursor if doc["participants"][0].get("status") == statuses[doc["_id"]]}
+    return applied, set(previous)
+
+async def update_attendance_statuses(user_id: str, responses: List[Dict[str, str]]) -> BulkResult:
+    """Apply many RSVPs of one user with a single unordered bulk_write.
+
+    Each response is {"event_id", "status"}; the last status given for an event
+    wins. Events that don't exist or that the user is not part of get NOT_FOUND,
+    RSVPs that raced another change of the same RSVP get CONFLICT.
+    """
+    statuses = {}
+    for response in responses:
+        event_id = response["event_id"]
+        # Canonical form so it compares equal to the ids read back from Mongo
+        key = str(ObjectId(event_id)) if ObjectId.is_valid(event_id) else event_id
+        statuses[key] = response["status"]
+    by_id = {ObjectId(event_id): status for event_id, status in statuses.items() if ObjectId.is_valid(event_id)}
+    if separate_participants():
+        previous, members = await participant_store.set_statuses(user_id, by_id)
+        if previous:
+            result = await events_collection.bulk_write([
+                UpdateOne({"_id": event_id, **COUNTED}, {"$inc": {**transition_inc(old, by_id[event_id]), "version": 1}})
+                for event_id, old in previous.items()
+            ], ordered=False)
+            if result.matched_count < len(previous):
+                # Events that predate the counters: seeding counts the new statuses already
+                await seed_counters(list(previous))
+        applied = set(previous)
+    else:
+        applied, members = await _set_embedded_statuses(user_id, by_id)
+    applied_ids = {str(event_id) for event_id in applied}
+    member_ids = {str(event_id) for event_id in members}
+    for event_id in applied_ids:
+        await event_cache.invalidate(event_id)
+        # bulk_write doesn't return post-images, so these deltas carry no version
+        await publish_status(event_id, user_id, statuses[event_id])
+    items = [
+        {"event_id": event_id,
+         "outcome": OK if event_id in applied_ids else CONFLICT if event_id in member_ids else NOT_FOUND}
+        for event_id in statuses
+    ]
+    return BulkResult(OK, items)
+
+async def get_event_stats(event_id: str) -> Optional[EventStats]:
+    """Attendance counters of an event from a single projected read"""
     if not ObjectId.is_valid(event_id):
         return None
-    
-    # Check if user is already a participant
-    event = await events_collection.find_one({
-        "_id": ObjectId(event_id),
-        "participants.user_id": user_id
-    })
-    
-    if event:
-        # User is already a participant
-        return await get_event_by_id(event_id)
-    
-    # Add user as attendee
-    participant = EventParticipant(
-        user_id=user_id,
-        role="attendee"
-    )
-    
-    result = await events_collection.update_one(
-        {"_id": ObjectId(event_id)},
-        {"$push": {"participants": participant.dict()}}
+    projection = {"participant_count": 1, "role_counts": 1, "status_counts": 1}
+    event = await events_collection.find_one({"_id": ObjectId(event_id)}, projection)
+    if event and "status_counts" not in event:
+        # Written before the counters existed: compute and store them once
+        await reconcile_counters([event["_id"]])
+        event = await events_collection.find_one({"_id": ObjectId(event_id)}, projection)
+    if not event:
+        return None
+    return EventStats(
+        event_id=str(event["_id"]),
+        participant_count=event.get("participant_count", 0),
+        role_counts=event.get("role_counts", {}),
+        status_counts=event.get("status_counts", {})
     )
-    
-    if result.modified_count > 0:
-        return await get_event_by_id(event_id)
-    return None
 
-async def update_attendance_status(event_id: str, user_id: str, status: str) -> EventOut:
+async def get_event_participants(event_id: str, limit: Optional[int] = None, cursor: Optional[str] = None,
+                                 loader: Optional[UserEmailLoader] = None) -> Optional[ParticipantPage]:
+    """One page of an event's participants; None if the event doesn't exist.
+
+    Separately stored participants are paged by user_id with a range filter;
+    embedded ones with a $slice projection and an offset cursor.
+    """
     if not ObjectId.is_valid(event_id):
         return None
-    result = await events_collection.update_one(
-        {"_id": ObjectId(event_id), "participants.user_id": user_id},
-        {"$set": {"participants.$.status": status}}
-    )
-    
-    if result.modified_count > 0:
-        return await get_event_by_id(event_id)
-    return None
+    limit = min(limit or settings.participant_page_size, settings.max_page_size)
+    if separate_participants():
+        if cursor:
+            participant_filter(cursor)  # Raise InvalidCursor before querying
+        if not await events_collection.find_one({"_id": ObjectId(event_id)}, {"_id": 1}):
+            return None
+        docs, next_cursor = await participant_store.page(ObjectId(event_id), limit, cursor)
+    else:
+        offset = decode_offset(cursor) if cursor else 0
+        event = await events_collection.find_one(
+            {"_id": ObjectId(event_id)}, {"_id": 1, "participants": {"$slice": [offset, limit + 1]}}
+        )
+        if not event:
+            return None
+        docs = event.get("participants", [])
+        next_cursor = offset_cursor(offset + limit) if len(docs) > limit else None
+        docs = docs[:limit]
 
-async def search_events(user_id: str, keyword: str = None, start_date: datetime = None, 
-                       end_date: datetime = None, role: str = None) -> List[EventOut]:
+    participants = [EventParticipant.model_validate(doc) for doc in docs]
+    missing = [participant.user_id for participant in participants if not participant.email]
+    if missing:
+        emails = await (loader or UserEmailLoader()).load_many(missing)
+        participants = [
+            participant if participant.email
+            else participant.model_copy(update={"email": emails.get(participant.user_id, UNKNOWN_EMAIL)})
+            for participant in participants
+        ]
+    return ParticipantPage(participants=participants, next_cursor=next_cursor)
+
+# IndexNotFound: "text index required for $text query"
+_INDEX_NOT_FOUND = 27
+
+# Set once a text search fails for lack of the index; searches then use regex until restart
+_text_index_missing = False
+
+def _search_mode(mode: Optional[str]) -> str:
+    mode = mode or settings.search_mode
+    return "regex" if mode == "text" and _text_index_missing else mode
+
+def _fall_back_to_regex(error: OperationFailure, keyword: Optional[str], mode: Optional[str]) -> bool:
+    """Whether a failed search was a text search missing its index; if so later searches use regex"""
+    global _text_index_missing
+    if not keyword or _search_mode(mode) != "text" or error.code != _INDEX_NOT_FOUND:
+        return False
+    print(f"Text index missing, searching with regex until restart: {error}")
+    _text_index_missing = True
+    return True
+
+def _build_search_query(user_id: str, keyword: str = None, start_date: datetime = None,
+                        end_date: datetime = None, role: str = None, mode: str = None):
+    """Returns (query, projection, sort) for search_events"""
     # Build query for all events (not restricted to user participation)
     query = {}
+    projection = _summary_projection(user_id)
+    sort = KEYSET_SORT  # Sort by date ascending
+    mode = _search_mode(mode)
     
     # Add keyword search for both event names and descriptions
-    if keyword:
-        # Use regex for case-insensitive partial matching
+    if keyword and mode == "regex":
+        # Use regex for case-insensitive partial matching (cannot use an index)
         regex_pattern = re.compile(f".*{re.escape(keyword)}.*", re.IGNORECASE)
         query["$or"] = [
             {"title": {"$regex": regex_pattern}},
             {"description": {"$regex": regex_pattern}}
         ]
+    elif keyword:
+        # Use the title/description text index: whole-word, stemmed, case-insensitive
+        # matching ranked by relevance, with date as the tie-breaker
+        query["$text"] = {"$search": keyword}
+        projection["score"] = {"$meta": "textScore"}
+        sort = [("score", {"$meta": "textScore"}), ("date", 1), ("_id", 1)]
     
     # Add date range filters
     date_filter = {}
@@ -240,20 +933,128 @@ async def search_events(user_id: str, keyword: str = None, start_date: datetime
         query["date"] = date_filter
     
     # Add role filter (filter by participant role)
-    if role:
+    if role and separate_participants():
+        # Every event has exactly one organizer, so "attendee" means someone besides them joined
+        if role == "attendee":
+            query["participant_count"] = {"$gt": 1}
+        elif role != "organizer":
+            query["_id"] = {"$in": []}
+    elif role:
         query["participants.role"] = role
     
-    events = []
+    return query, projection, sort
+
+async def search_events(user_id: str, keyword: str = None, start_date: datetime = None, 
+                       end_date: datetime = None, role: str = None, mode: str = None,
+                       limit: Optional[int] = None, cursor: Optional[str] = None) -> EventPage:
+    query, projection, sort = _build_search_query(user_id, keyword, start_date, end_date, role, mode)
     try:
-        cursor = events_collection.find(query).sort("date", 1)  # Sort by date ascending
-        async for event in cursor:
-            try:
-                event["_id"] = str(event["_id"])
-                event_obj = EventOut(**event)
-                events.append(await enrich_event_with_emails(event_obj))
-            except Exception as e:
-                print(f"Error processing event in search_events: {e}")
-                continue
-    except Exception as e:
-        print(f"Error in search_events: {e}")
-    return events
\ No newline at end of file
+        page = await _page_events(query, projection, "search_events", limit, cursor, sort)
+    except OperationFailure as e:
+        if not _fall_back_to_regex(e, keyword, mode):
+            raise
+        return await search_events(user_id, keyword, start_date, end_date, role, mode, limit, cursor)
+    return await _with_membership(user_id, page)
+
+async def _stream_with_fallback(pages: AsyncIterator[EventPage], search_args: dict) -> AsyncIterator[EventPage]:
+    """Restart a text search stream with regex if it fails before anything was sent"""
+    sent = False
+    try:
+        async for page in pages:
+            sent = True
+            yield page
+    except OperationFailure as e:
+        if sent or not _fall_back_to_regex(e, search_args["keyword"], search_args["mode"]):
+            raise
+        async for page in stream_search_events(**search_args):
+            yield page
+
+def stream_search_events(user_id: str, keyword: str = None, start_date: datetime = None,
+                         end_date: datetime = None, role: str = None, mode: str = None,
+                         limit: Optional[int] = None, cursor: Optional[str] = None) -> AsyncIterator[EventPage]:
+    query, projection, sort = _build_search_query(user_id, keyword, start_date, end_date, role, mode)
+    pages = _membership_stream(user_id, _stream_events(query, projection, "search_events", limit, cursor, sort))
+    if _search_mode(mode) != "text" or not keyword:
+        return pages
+    return _stream_with_fallback(pages, dict(
+        user_id=user_id, keyword=keyword, start_date=start_date, end_date=end_date,
+        role=role, mode=mode, limit=limit, cursor=cursor
+    ))
+
+# Locations listed in the by_location facet
+FACET_LOCATIONS = 20
+
+def _role_expression(user_id: str, my_event_ids: Optional[List[ObjectId]]) -> dict:
+    """The caller's role in an event, from the event document alone"""
+    if my_event_ids is None:
+        member = {"$in": [user_id, {"$ifNull": ["$participants.user_id", []]}]}
+    else:
+        member = {"$in": ["$_id", my_event_ids]}
+    return {"$cond": [{"$eq": ["$organizer_id", user_id]}, "organizer", {"$cond": [member, "attendee", "none"]}]}
+
+def _facet_pipelines(user_id: str, my_event_ids: Optional[List[ObjectId]]) -> dict:
+    by_count = {"$sort": {"count": -1, "_id": 1}}
+    return {
+        "by_month": [
+            {"$group": {"_id": {"$dateToString": {"format": "%Y-%m", "date": "$date"}}, "count": {"$sum": 1}}},
+            {"$sort": {"_id": 1}},
+        ],
+        "by_role": [{"$group": {"_id": _role_expression(user_id, my_event_ids), "count": {"$sum": 1}}}, by_count],
+        "by_location": [{"$group": {"_id": "$location", "count": {"$sum": 1}}}, by_count, {"$limit": FACET_LOCATIONS}],
+        # Summing the counters avoids unwinding participants; events without counters add nothing
+        "by_status": [{"$group": {"_id": None, **{
+            key: {"$sum": f"$status_counts.{key}"} for key in (*STATUS_KEYS.values(), PENDING, OTHER)
+        }}}],
+    }
+
+def _to_facets(result: dict) -> SearchFacets:
+    def buckets(name: str) -> List[FacetBucket]:
+        return [FacetBucket(value=row["_id"], count=row["count"]) for row in result.get(name, [])]
+    totals = (result.get("by_status") or [{}])[0]
+    return SearchFacets(
+        by_month=buckets("by_month"),
+        by_role=buckets("by_role"),
+        by_location=buckets("by_location"),
+        by_status=[FacetBucket(value=key, count=count) for key, count in totals.items() if key != "_id"],
+    )
+
+async def search_events_with_facets(user_id: str, keyword: str = None, start_date: datetime = None,
+                                    end_date: datetime = None, role: str = None, mode: str = None,
+                                    limit: Optional[int] = None,
+                                    cursor: Optional[str] = None) -> Tuple[EventPage, SearchFacets]:
+    """One page of search results plus facet counts from a single $facet aggregation.
+
+    Results and facets share the $match stage, so the scan runs once. The cursor
+    only narrows the results; facets always cover every match.
+    """
+    query, projection, sort = _build_search_query(user_id, keyword, start_date, end_date, role, mode)
+    limit = _page_size(limit)
+    offset = 0
+    results = []
+    if cursor and sort == KEYSET_SORT:
+        results.append({"$match": keyset_filter(cursor)})
+    elif cursor:
+        offset = decode_offset(cursor)
+    results.append({"$sort": dict(sort)})
+    if offset:
+        results.append({"$skip": offset})
+    results += [{"$limit": limit + 1}, {"$project": projection}]
+    my_event_ids = await participant_store.event_ids_for_user(user_id) if separate_participants() else None
+
+    try:
+        found = await events_collection.aggregate([
+            {"$match": query},
+            {"$facet": {"results": results, **_facet_pipelines(user_id, my_event_ids)}},
+        ]).to_list(length=1)
+    except OperationFailure as e:
+        if not _fall_back_to_regex(e, keyword, mode):
+            raise
+        return await search_events_with_facets(user_id, keyword, start_date, end_date, role, mode, limit, cursor)
+    result = found[0] if found else {}
+    events = [_to_summary(event) for event in result.get("results", [])]
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = _next_cursor(events[-1], sort, offset + limit)
+    page = await _with_membership(user_id, EventPage(events=events, next_cursor=next_cursor))
+    return page, _to_facets(result)
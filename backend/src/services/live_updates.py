@@ -0,0 +1,178 @@
+"""Pub/sub fan-out of live event updates to WebSocket subscribers.
+
+Write paths publish small deltas such as
+``{"type": "status_changed", "event_id": ..., "user_id": ..., "status": "Going"}``
+on a topic: ``event:<event_id>`` for everyone watching an event, ``user:<user_id>``
+for a user's own invitations. Deltas are serialized once and handed to a broker,
+which delivers them back to the hub of every worker; the hub copies them into
+the queue of each subscriber of that topic.
+
+The default LocalBroker only delivers inside this process. With several workers
+point ``live_broker`` at a shared implementation (``"package.module:ClassName"``,
+e.g. on Redis pub/sub) so subscribers see writes handled by other workers.
+
+Queues are bounded by ``live_queue_size``. A subscriber that falls that far
+behind loses its backlog and gets a single ``{"type": "resync"}`` instead, telling
+the client to re-read what it shows (a conditional GET), so a slow consumer
+never blocks writers or holds an unbounded amount of memory.
+"""
+import asyncio
+import importlib
+from typing import Callable, Dict, List, Optional, Set
+
+from ..config import settings
+from ..metrics import registry
+from ..models.Event_model import EventOut
+from ..serialization import dumps
+
+RESYNC = dumps({"type": "resync"}).decode()
+
+live_subscribers = registry.gauge("live_subscribers", "Open live update subscriptions")
+live_published = registry.counter("live_messages_published_total", "Live update deltas published", ("type",))
+live_dropped = registry.counter(
+    "live_messages_dropped_total", "Live update deltas discarded because a subscriber fell behind")
+
+def event_topic(event_id) -> str:
+    return f"event:{event_id}"
+
+def user_topic(user_id: str) -> str:
+    return f"user:{user_id}"
+
+class Broker:
+    """Interface for moving published messages between workers.
+
+    ``deliver(topic, message)`` must be called on the event loop the hub runs on.
+    """
+
+    async def start(self, deliver: Callable[[str, bytes], None]):
+        raise NotImplementedError
+
+    async def publish(self, topic: str, message: bytes):
+        raise NotImplementedError
+
+    async def stop(self):
+        raise NotImplementedError
+
+class LocalBroker(Broker):
+    """Delivers straight back to this process; enough for a single worker"""
+
+    def __init__(self):
+        self._deliver: Optional[Callable[[str, bytes], None]] = None
+
+    async def start(self, deliver: Callable[[str, bytes], None]):
+        self._deliver = deliver
+
+    async def publish(self, topic: str, message: bytes):
+        if self._deliver is not None:
+            self._deliver(topic, message)
+
+    async def stop(self):
+        self._deliver = None
+
+class Subscription:
+    """One consumer (a WebSocket) listening on any number of topics through one bounded queue"""
+
+    def __init__(self, hub: "Hub", max_queued: int):
+        self.hub = hub
+        self.topics: Set[str] = set()
+        self._queue: asyncio.Queue = asyncio.Queue(max_queued)
+
+    def subscribe(self, topic: str):
+        self.topics.add(topic)
+        self.hub._topics.setdefault(topic, set()).add(self)
+
+    def unsubscribe(self, topic: str):
+        self.topics.discard(topic)
+        subscribers = self.hub._topics.get(topic)
+        if subscribers is not None:
+            subscribers.discard(self)
+            if not subscribers:
+                del self.hub._topics[topic]
+
+    def offer(self, message: str):
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind to catch up delta by delta: replace the backlog with one resync
+            dropped = 0
+            while not self._queue.empty():
+                self._queue.get_nowait()
+                dropped += 1
+            live_dropped.inc(dropped + 1)
+            self._queue.put_nowait(RESYNC)
+
+    async def get(self) -> str:
+        return await self._queue.get()
+
+    def close(self):
+        for topic in list(self.topics):
+            self.unsubscribe(topic)
+        if self in self.hub._subscriptions:
+            self.hub._subscriptions.discard(self)
+            live_subscribers.dec()
+
+class Hub:
+    def __init__(self, broker: Broker):
+        self.broker = broker
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self._subscriptions: Set[Subscription] = set()
+        self._started = False
+
+    async def start(self):
+        if not self._started:
+            self._started = True
+            await self.broker.start(self._deliver)
+
+    async def stop(self):
+        if self._started:
+            self._started = False
+            await self.broker.stop()
+
+    def subscription(self) -> Subscription:
+        subscription = Subscription(self, settings.live_queue_size)
+        self._subscriptions.add(subscription)
+        live_subscribers.inc()
+        return subscription
+
+    def _deliver(self, topic: str, message: bytes):
+        subscribers = self._topics.get(topic)
+        if subscribers:
+            text = message.decode()
+            for subscription in list(subscribers):
+                subscription.offer(text)
+
+    async def publish(self, topic: str, delta: dict):
+        """Never raises: a broker outage must not fail the write that was already applied"""
+        try:
+            await self.broker.publish(topic, dumps(delta))
+            live_published.inc(type=delta.get("type", ""))
+        except Exception as e:
+            print(f"Live update on {topic} not published: {e}")
+
+def _create_broker(spec: str) -> Broker:
+    if spec == "local":
+        return LocalBroker()
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+live_hub = Hub(_create_broker(settings.live_broker))
+
+async def publish_added(event: EventOut, user_ids: List[str], via: str):
+    """Tell the event's watchers who was added, and each added user about their invitation"""
+    event_id = str(event.id)
+    await live_hub.publish(event_topic(event_id), {
+        "type": "participants_added", "event_id": event_id, "version": event.version,
+        "user_ids": user_ids, "via": via,
+    })
+    for user_id in user_ids:
+        await live_hub.publish(user_topic(user_id), {
+            "type": "invited" if via == "invite" else "joined", "event_id": event_id,
+            "version": event.version, "title": event.title,
+        })
+
+async def publish_status(event_id: str, user_id: str, status: str, version: Optional[int] = None):
+    delta = {"type": "status_changed", "event_id": event_id, "user_id": user_id, "status": status}
+    if version is not None:
+        delta["version"] = version
+    await live_hub.publish(event_topic(event_id), delta)
+    await live_hub.publish(user_topic(user_id), delta)
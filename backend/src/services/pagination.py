@@ -0,0 +1,65 @@
+import base64
+import binascii
+import json
+from bson import ObjectId
+from bson.errors import InvalidId
+from datetime import datetime
+from typing import Dict
+
+# Default ordering of every event listing. (date, _id) is unique, so it can be
+# resumed with a range filter instead of skip()
+KEYSET_SORT = [("date", 1), ("_id", 1)]
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(values: Dict) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(token: str) -> Dict:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(values, dict):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+def keyset_cursor(date: datetime, event_id: str) -> str:
+    """Cursor pointing just after the event with the given (date, _id)"""
+    return encode_cursor({"d": date.isoformat(), "i": str(event_id)})
+
+def keyset_filter(token: str) -> Dict:
+    """Query fragment matching the events that sort after the cursor position"""
+    values = decode_cursor(token)
+    try:
+        date = datetime.fromisoformat(values["d"])
+        event_id = ObjectId(values["i"])
+    except (KeyError, TypeError, ValueError, InvalidId) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    return {"$or": [
+        {"date": {"$gt": date}},
+        {"date": date, "_id": {"$gt": event_id}}
+    ]}
+
+def participant_cursor(user_id: str) -> str:
+    """Cursor for participant listings, which are ordered by user_id"""
+    return encode_cursor({"u": user_id})
+
+def participant_filter(token: str) -> Dict:
+    user_id = decode_cursor(token).get("u")
+    if not isinstance(user_id, str):
+        raise InvalidCursor("Invalid cursor")
+    return {"user_id": {"$gt": user_id}}
+
+def offset_cursor(offset: int) -> str:
+    """Cursor for orderings that cannot be range-filtered (e.g. text relevance)"""
+    return encode_cursor({"o": offset})
+
+def decode_offset(token: str) -> int:
+    offset = decode_cursor(token).get("o")
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursor("Invalid cursor")
+    return offset
@@ -0,0 +1,179 @@
+"""EventParticipants collection: one document per participant, used when
+settings.participant_storage is "collection".
+
+Documents look like ``{event_id: ObjectId, user_id: str, role, status, email}``
+and are unique on (event_id, user_id), so adding a participant is a plain insert
+that can't duplicate and never rewrites the event document. The event keeps a
+``participant_count`` that writers maintain with $inc.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from ..config import settings
+from ..db import participants_collection
+from ..models.Event_model import EventParticipant
+from .pagination import participant_cursor, participant_filter
+
+_FIELDS = {"_id": 0, "user_id": 1, "role": 1, "status": 1, "email": 1}
+
+def separate_participants() -> bool:
+    return settings.participant_storage == "collection"
+
+def _document(event_id: ObjectId, participant: EventParticipant) -> dict:
+    return {"event_id": event_id, **participant.model_dump()}
+
+async def insert_participant(event_id: ObjectId, participant: EventParticipant) -> bool:
+    """Add a participant; False if they already are one"""
+    try:
+        await participants_collection.insert_one(_document(event_id, participant))
+        return True
+    except DuplicateKeyError:
+        return False
+
+async def insert_participants(event_id: ObjectId, participants: List[EventParticipant]) -> Set[str]:
+    """Add many participants in one unordered insert. Returns the user ids actually added."""
+    if not participants:
+        return set()
+    user_ids = {participant.user_id for participant in participants}
+    try:
+        await participants_collection.insert_many(
+            [_document(event_id, participant) for participant in participants], ordered=False
+        )
+        return user_ids
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(error.get("code") != 11000 for error in errors):
+            raise
+        # Duplicates are existing members; everything else was inserted
+        return user_ids - {participants[error["index"]].user_id for error in errors}
+
+async def set_status(event_id: ObjectId, user_id: str, status: str) -> Optional[dict]:
+    """Set one RSVP; returns the participant as it was before (for counter transitions), None if not one"""
+    return await participants_collection.find_one_and_update(
+        {"event_id": event_id, "user_id": user_id}, {"$set": {"status": status}},
+        projection={"_id": 0, "status": 1}, return_document=ReturnDocument.BEFORE
+    )
+
+async def set_statuses(user_id: str, statuses: Dict[ObjectId, str]) -> Tuple[Dict[ObjectId, Optional[str]], Set[ObjectId]]:
+    """One user's RSVPs in a single unordered bulk_write.
+
+    Each update only applies if the status is still the one read just before,
+    so the caller can move the counters. Returns ({event_id: previous status}
+    for the applied ones, every event the user is part of); members missing
+    from the first are RSVPs that raced another write.
+    """
+    if not statuses:
+        return {}, set()
+    previous = {event_id: doc.get("status") for event_id, doc in (await memberships(user_id, statuses)).items()}
+    if not previous:
+        return {}, set()
+    requests = [
+        UpdateOne({"event_id": event_id, "user_id": user_id, "status": old}, {"$set": {"status": statuses[event_id]}})
+        for event_id, old in previous.items()
+    ]
+    result = await participants_collection.bulk_write(requests, ordered=False)
+    if result.matched_count == len(requests):
+        return previous, set(previous)
+    current = await memberships(user_id, previous)
+    applied = {
+        event_id: old for event_id, old in previous.items()
+        if event_id in current and current[event_id].get("status") == statuses[event_id]
+    }
+    return applied, set(previous)
+
+async def set_event_statuses(event_id: ObjectId, statuses: Dict[str, str]) -> Tuple[Dict[str, Optional[str]], Set[str]]:
+    """Many users' RSVPs to one event in a single unordered bulk_write.
+
+    Same compare-and-set as set_statuses, keyed by user: returns ({user_id:
+    previous status} for the applied ones, every user that is a participant).
+    """
+    if not statuses:
+        return {}, set()
+    found = participants_collection.find(
+        {"event_id": event_id, "user_id": {"$in": list(statuses)}}, {"_id": 0, "user_id": 1, "status": 1}
+    )
+    previous = {doc["user_id"]: doc.get("status") async for doc in found}
+    if not previous:
+        return {}, set()
+    requests = [
+        UpdateOne({"event_id": event_id, "user_id": user_id, "status": old}, {"$set": {"status": statuses[user_id]}})
+        for user_id, old in previous.items()
+    ]
+    result = await participants_collection.bulk_write(requests, ordered=False)
+    if result.matched_count == len(requests):
+        return previous, set(previous)
+    found = participants_collection.find(
+        {"event_id": event_id, "user_id": {"$in": list(previous)}}, {"_id": 0, "user_id": 1, "status": 1}
+    )
+    current = {doc["user_id"]: doc.get("status") async for doc in found}
+    applied = {
+        user_id: old for user_id, old in previous.items()
+        if user_id in current and current[user_id] == statuses[user_id]
+    }
+    return applied, set(previous)
+
+async def member_ids(event_id: ObjectId, user_ids: Iterable[str]) -> Set[str]:
+    """Which of these users already participate"""
+    found = participants_collection.find(
+        {"event_id": event_id, "user_id": {"$in": list(user_ids)}}, {"_id": 0, "user_id": 1}
+    )
+    return {doc["user_id"] async for doc in found}
+
+async def is_member(event_id: ObjectId, user_id: str) -> bool:
+    return bool(await member_ids(event_id, [user_id]))
+
+async def event_ids_for_user(user_id: str) -> List[ObjectId]:
+    """Covered by the (user_id, event_id) index"""
+    found = participants_collection.find({"user_id": user_id}, {"_id": 0, "event_id": 1})
+    return [doc["event_id"] async for doc in found]
+
+async def event_ids_with_stale_email(user_ids_emails: Dict[str, str]) -> Set[ObjectId]:
+    if not user_ids_emails:
+        return set()
+    found = participants_collection.find(
+        {"$or": [{"user_id": user_id, "email": {"$ne": email}} for user_id, email in user_ids_emails.items()]},
+        {"_id": 0, "event_id": 1}
+    )
+    return {doc["event_id"] async for doc in found}
+
+async def set_emails(user_emails: Dict[str, str]):
+    """Overwrite stale emails of these users on all their participant documents"""
+    await participants_collection.bulk_write([
+        UpdateMany({"user_id": user_id, "email": {"$ne": email}}, {"$set": {"email": email}})
+        for user_id, email in user_emails.items()
+    ], ordered=False)
+
+async def memberships(user_id: str, event_ids: Iterable[ObjectId]) -> Dict[ObjectId, dict]:
+    """The user's own participant document for each of these events they are part of"""
+    found = participants_collection.find(
+        {"user_id": user_id, "event_id": {"$in": list(event_ids)}}, {"_id": 0, "event_id": 1, "role": 1, "status": 1}
+    )
+    return {doc["event_id"]: doc async for doc in found}
+
+async def preview(event_id: ObjectId, organizer_id: str, size: Optional[int] = None) -> List[dict]:
+    """First participants of an event for the event payload, organizer first"""
+    size = size or settings.participant_page_size
+    docs = await participants_collection.find({"event_id": event_id}, _FIELDS).sort("user_id", 1).to_list(length=size)
+    organizer = next((doc for doc in docs if doc["user_id"] == organizer_id), None)
+    if organizer is None:
+        organizer = await participants_collection.find_one({"event_id": event_id, "user_id": organizer_id}, _FIELDS)
+    else:
+        docs.remove(organizer)
+    return ([organizer] if organizer else []) + docs[:size - 1 if organizer else size]
+
+async def page(event_id: ObjectId, limit: int, cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    """One page of participants ordered by user_id, resumed with a range filter"""
+    query = {"event_id": event_id}
+    if cursor:
+        query.update(participant_filter(cursor))
+    docs = await participants_collection.find(query, _FIELDS).sort("user_id", 1).to_list(length=limit + 1)
+    if len(docs) > limit:
+        docs = docs[:limit]
+        return docs, participant_cursor(docs[-1]["user_id"])
+    return docs, None
+
+async def delete_for_event(event_id: ObjectId):
+    await participants_collection.delete_many({"event_id": event_id})
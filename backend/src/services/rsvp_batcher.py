@@ -0,0 +1,258 @@
+"""Write-coalescing joins and RSVPs for hot events (settings.rsvp_write_mode = "batched").
+
+Instead of one conditional update plus one enriched re-read per request, joins
+and RSVPs are queued per event and flushed every ``rsvp_batch_interval_ms``
+(or as soon as ``rsvp_batch_max_ops`` are waiting). A flush of an embedded event
+is one read of the involved participants, at most two updates (a $push of the
+new attendees, then every status change through arrayFilters) and one enriched
+read shared by every caller in the batch. With separately stored participants
+it is one insert_many, one bulk_write of the status changes and one $inc of
+the event counters.
+
+Guarantees:
+
+* Durability is unchanged: a caller's awaitable resolves only after Mongo
+  acknowledged its write, so a response is never sent for a write that isn't
+  stored. Operations still queued when a worker dies are lost, but their
+  callers never got a response; joins and RSVPs are idempotent and safe to resend.
+* Per event and per worker, batches are applied one after the other in arrival
+  order, and within a batch the last RSVP of a user wins. Joins in a batch are
+  applied before its RSVPs, so an RSVP queued just before the same user's join
+  succeeds instead of failing.
+* Across workers there is no ordering, as before. Each update is guarded by the
+  event version read at the start of the flush; a flush that keeps losing to
+  other writers hands its remaining operations to the per-request path.
+* Callers only wait up to one interval longer; reads never wait.
+"""
+import asyncio
+from functools import partial
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from bson import ObjectId
+
+from ..config import settings
+from ..db import events_collection
+from ..models.Event_model import EventOut, EventParticipant
+from . import participant_store
+from .counters import added_inc, seed_counters, transition_inc
+from .event_cache import event_cache
+from .event_services import (
+    MutationResult, OK, NOT_FOUND, ALREADY_MEMBER, NOT_PARTICIPANT,
+    _lookup_email, inc_separate_counters, join_event, read_enriched_event, update_attendance_status
+)
+from .live_updates import publish_added, publish_status
+from .participant_store import separate_participants
+from .user_loader import UserEmailLoader
+
+JOIN = "join"
+RSVP = "rsvp"
+
+# Version-guarded attempts before a contended batch falls back to the per-request path
+_FLUSH_ATTEMPTS = 5
+
+class _Operation(NamedTuple):
+    kind: str
+    user_id: str
+    value: Optional[str]  # Email for JOIN, status for RSVP
+    future: asyncio.Future
+
+class _Applied(NamedTuple):
+    added: Set[str]  # Users this batch made participants
+    members: Set[str]  # Involved users that are participants afterwards
+    unapplied: Set[str]  # Users whose operations must go through the per-request path
+
+def _merge_inc(total: dict, inc: dict):
+    for field, amount in inc.items():
+        total[field] = total.get(field, 0) + amount
+
+async def _embedded_state(event_id: ObjectId, user_ids: List[str]):
+    """(version, {user_id: status} of the involved participants, whether the event has counters),
+    None if the event is gone"""
+    found = await events_collection.aggregate([
+        {"$match": {"_id": event_id}},
+        {"$project": {"version": 1, "status_counts": 1, "participants": {"$filter": {
+            "input": {"$ifNull": ["$participants", []]}, "as": "p", "cond": {"$in": ["$$p.user_id", user_ids]},
+        }}}},
+    ]).to_list(length=1)
+    if not found:
+        return None
+    statuses = {p["user_id"]: p.get("status") for p in found[0]["participants"]}
+    return found[0].get("version"), statuses, "status_counts" in found[0]
+
+async def _apply_embedded(event_id: ObjectId, joins: Dict[str, Optional[str]],
+                          statuses: Dict[str, str]) -> Optional[_Applied]:
+    added: Set[str] = set()
+    current: Dict[str, Optional[str]] = {}
+    for _ in range(_FLUSH_ATTEMPTS):
+        state = await _embedded_state(event_id, list({*joins, *statuses}))
+        if state is None:
+            return None
+        version, current, counted = state
+        if not counted:
+            # Seeding bumps the version, so read again before the guarded updates
+            await seed_counters([event_id])
+            continue
+        new = {user_id: email for user_id, email in joins.items() if user_id not in current}
+        if new:
+            # $push and a positional $set on the same array can't share one update
+            result = await events_collection.update_one(
+                {"_id": event_id, "version": version},
+                {"$push": {"participants": {"$each": [
+                    EventParticipant(user_id=user_id, role="attendee", email=email).model_dump()
+                    for user_id, email in new.items()
+                ]}}, "$inc": {**added_inc("attendee", len(new)), "version": 1}}
+            )
+            if not result.modified_count:
+                continue
+            added |= set(new)
+            current.update({user_id: None for user_id in new})
+            version = (version or 0) + 1
+        changes = {user_id: status for user_id, status in statuses.items()
+                   if user_id in current and current[user_id] != status}
+        if changes:
+            inc = {"version": 1}
+            for user_id, status in changes.items():
+                _merge_inc(inc, transition_inc(current[user_id], status))
+            result = await events_collection.update_one(
+                {"_id": event_id, "version": version},
+                {"$set": {f"participants.$[u{i}].status": status for i, status in enumerate(changes.values())},
+                 "$inc": inc},
+                array_filters=[{f"u{i}.user_id": user_id} for i, user_id in enumerate(changes)]
+            )
+            if not result.modified_count:
+                continue
+        return _Applied(added, set(current), set())
+    # Joins that went through stay applied; the rest is retried one by one
+    unapplied = {user_id for user_id in joins if user_id not in added} | set(statuses)
+    return _Applied(added, set(current), unapplied)
+
+async def _apply_separate(event_id: ObjectId, joins: Dict[str, Optional[str]],
+                          statuses: Dict[str, str]) -> Optional[_Applied]:
+    if not await events_collection.find_one({"_id": event_id}, {"_id": 1}):
+        return None
+    added = await participant_store.insert_participants(event_id, [
+        EventParticipant(user_id=user_id, role="attendee", email=email) for user_id, email in joins.items()
+    ])
+    previous, members = await participant_store.set_event_statuses(event_id, statuses)
+    inc = {}
+    if added:
+        _merge_inc(inc, added_inc("attendee", len(added)))
+    for user_id, old in previous.items():
+        _merge_inc(inc, transition_inc(old, statuses[user_id]))
+    if added or previous:
+        await inc_separate_counters(event_id, inc)
+    members |= set(joins)
+    # Members missing from previous raced another write of the same RSVP
+    return _Applied(added, members, {user_id for user_id in statuses if user_id in members and user_id not in previous})
+
+class RsvpBatcher:
+    def __init__(self):
+        self._pending: Dict[str, List[_Operation]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+
+    async def join(self, event_id: str, user_id: str, loader: Optional[UserEmailLoader] = None) -> MutationResult:
+        if not ObjectId.is_valid(event_id):
+            return MutationResult(NOT_FOUND)
+        return await self._submit(str(ObjectId(event_id)), JOIN, user_id, await _lookup_email(user_id, loader))
+
+    async def respond(self, event_id: str, user_id: str, status: str) -> MutationResult:
+        if not ObjectId.is_valid(event_id):
+            return MutationResult(NOT_FOUND)
+        return await self._submit(str(ObjectId(event_id)), RSVP, user_id, status)
+
+    async def _submit(self, event_id: str, kind: str, user_id: str, value: Optional[str]) -> MutationResult:
+        loop = asyncio.get_running_loop()
+        operation = _Operation(kind, user_id, value, loop.create_future())
+        queued = self._pending.setdefault(event_id, [])
+        queued.append(operation)
+        if len(queued) >= settings.rsvp_batch_max_ops:
+            self._flush(event_id)
+        elif len(queued) == 1:
+            self._timers[event_id] = loop.call_later(
+                settings.rsvp_batch_interval_ms / 1000, self._flush, event_id
+            )
+        # Shielded so a disconnecting client doesn't cancel the result other callers share
+        return await asyncio.shield(operation.future)
+
+    def _flush(self, event_id: str):
+        timer = self._timers.pop(event_id, None)
+        if timer is not None:
+            timer.cancel()
+        operations = self._pending.pop(event_id, None)
+        if not operations:
+            return
+        task = asyncio.create_task(self._run(event_id, operations, self._running.get(event_id)))
+        self._running[event_id] = task
+        task.add_done_callback(partial(self._finished, event_id))
+
+    def _finished(self, event_id: str, task: asyncio.Task):
+        if self._running.get(event_id) is task:
+            del self._running[event_id]
+
+    async def _run(self, event_id: str, operations: List[_Operation], previous: Optional[asyncio.Task]):
+        if previous is not None:
+            # One batch per event at a time keeps arrival order and avoids racing our own version guard
+            await asyncio.wait([previous])
+        try:
+            results = await self._apply(event_id, operations)
+        except Exception as e:
+            for operation in operations:
+                if not operation.future.done():
+                    operation.future.set_exception(e)
+            return
+        for operation, result in zip(operations, results):
+            if not operation.future.done():
+                operation.future.set_result(result)
+
+    async def _apply(self, event_id: str, operations: List[_Operation]) -> List[MutationResult]:
+        joins: Dict[str, Optional[str]] = {}
+        statuses: Dict[str, str] = {}
+        for operation in operations:
+            if operation.kind == JOIN:
+                joins.setdefault(operation.user_id, operation.value)
+            else:
+                statuses[operation.user_id] = operation.value
+        apply = _apply_separate if separate_participants() else _apply_embedded
+        applied = await apply(ObjectId(event_id), joins, statuses)
+        if applied is None:
+            return [MutationResult(NOT_FOUND)] * len(operations)
+
+        event: Optional[EventOut] = None
+        if len(applied.unapplied) < len({operation.user_id for operation in operations}):
+            await event_cache.invalidate(event_id)
+            event = await read_enriched_event(event_id)
+            if event is not None:
+                await event_cache.set(event_id, event)
+                if applied.added:
+                    await publish_added(event, sorted(applied.added), "join")
+                for user_id, status in statuses.items():
+                    if user_id in applied.members and user_id not in applied.unapplied:
+                        await publish_status(event_id, user_id, status, event.version)
+
+        results = []
+        for operation in operations:
+            user_id = operation.user_id
+            if operation.kind == JOIN:
+                if user_id in applied.added:
+                    results.append(MutationResult(OK, event))
+                elif user_id in applied.unapplied:
+                    results.append(await join_event(event_id, user_id))
+                else:
+                    results.append(MutationResult(ALREADY_MEMBER, event))
+            elif user_id in applied.unapplied:
+                results.append(await update_attendance_status(event_id, user_id, operation.value))
+            elif user_id in applied.members:
+                results.append(MutationResult(OK, event))
+            else:
+                results.append(MutationResult(NOT_PARTICIPANT, event))
+        return results
+
+    async def drain(self):
+        """Flush everything queued and wait for it; called on shutdown"""
+        for event_id in list(self._pending):
+            self._flush(event_id)
+        if self._running:
+            await asyncio.wait(list(self._running.values()))
+
+rsvp_batcher = RsvpBatcher()
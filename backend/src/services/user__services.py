@@ -1,4 +1,9 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import asyncio
+import threading
+import time
 import bcrypt
 from jose import jwt
 from src.config import settings
@@ -6,7 +11,7 @@ from src.config import settings
 def hash_password(password: str) -> str:
     # Convert password to bytes and hash with bcrypt
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
@@ -16,6 +21,84 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     hashed_bytes = hashed_password.encode('utf-8')
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a different work factor than bcrypt_rounds"""
+    try:
+        # bcrypt hashes look like $2b$<cost>$<salt+hash>
+        return int(hashed_password.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return True
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; callers should answer 503"""
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL, so threads give real parallelism. At most
+    ``workers`` hashes run at once and at most ``queue_size`` more may wait;
+    anything beyond that is rejected immediately instead of piling up.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = None
+        self._pending = 0
+        self._metrics_lock = threading.Lock()
+        self.metrics = {
+            "operations_total": 0,
+            "rejected_total": 0,
+            "rehashed_total": 0,
+            "queue_wait_seconds_total": 0.0,
+            "queue_wait_seconds_max": 0.0,
+            "hash_seconds_total": 0.0,
+            "hash_seconds_max": 0.0,
+        }
+
+    def _timed(self, fn, submitted: float, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            self._observe("queue_wait_seconds", started - submitted)
+            self._observe("hash_seconds", finished - started)
+
+    def _observe(self, name: str, seconds: float):
+        # Called from the pool threads
+        with self._metrics_lock:
+            self.metrics[f"{name}_total"] += seconds
+            self.metrics[f"{name}_max"] = max(self.metrics[f"{name}_max"], seconds)
+
+    async def _run(self, fn, *args):
+        if self._pending >= self.workers + self.queue_size:
+            self.metrics["rejected_total"] += 1
+            raise PasswordHasherBusy("Password hashing queue is full")
+        if self._executor is None:
+            # Created lazily so each (forked) worker process gets its own threads
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        self._pending += 1
+        self.metrics["operations_total"] += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, fn, time.perf_counter(), *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+password_hasher = PasswordHasher(settings.password_hash_workers, settings.password_hash_queue_size)
+
 def create_access_token(subject: str, expires_delta: int | None = None) -> str:
     expire = datetime.utcnow() + timedelta(minutes=(expires_delta or settings.access_token_expire_minutes))
     to_encode = {"exp": expire, "sub": str(subject)}
@@ -25,3 +108,50 @@ def create_access_token(subject: str, expires_delta: int | None = None) -> str:
 def decode_token(token: str):
     payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
     return payload
+
+class TokenCache:
+    """LRU cache of already verified bearer tokens -> subject.
+
+    Entries expire at the token's own ``exp``, so a cached token is never
+    accepted for longer than jwt.decode would accept it. Tokens without an
+    ``exp`` are verified every time. The whole cache is dropped when the JWT
+    secret or algorithm changes, so rotating the secret revokes cached tokens.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._signing_key = None
+
+    def get_subject(self, token: str):
+        """Return the token's ``sub``; raises like decode_token for invalid tokens"""
+        signing_key = (settings.jwt_secret, settings.jwt_algorithm)
+        if signing_key != self._signing_key:
+            self._entries.clear()
+            self._signing_key = signing_key
+        
+        entry = self._entries.get(token)
+        if entry is not None:
+            subject, expires_at = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(token)
+                self.hits += 1
+                return subject
+            del self._entries[token]
+        
+        self.misses += 1
+        payload = decode_token(token)
+        subject = payload.get("sub")
+        expires_at = payload.get("exp")
+        if subject and isinstance(expires_at, (int, float)) and self.max_size > 0:
+            self._entries[token] = (subject, expires_at)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return subject
+
+    def clear(self):
+        self._entries.clear()
+
+token_cache = TokenCache(settings.token_cache_size)
@@ -0,0 +1,54 @@
+from ..db import users_collection
+from bson import ObjectId
+from typing import Dict, Iterable, List
+
+UNKNOWN_EMAIL = "Unknown"
+
+class UserEmailLoader:
+    """Batches and memoizes user email lookups for the lifetime of one request.
+
+    Ids requested through ``load_many`` are deduplicated, fetched with as few
+    ``$in`` queries as possible (chunked by ``chunk_size``) and cached, so later
+    calls in the same request only hit Mongo for ids that were never seen.
+    """
+
+    def __init__(self, chunk_size: int = 1000):
+        self.chunk_size = chunk_size
+        self.query_count = 0
+        self._emails: Dict[str, str] = {}
+
+    async def load_many(self, user_ids: Iterable[str]) -> Dict[str, str]:
+        user_ids = list(user_ids)
+
+        # Collect the ids we have not resolved yet, skipping duplicates and invalid ids
+        missing: List[ObjectId] = []
+        seen = set()
+        for user_id in user_ids:
+            if not ObjectId.is_valid(user_id):
+                continue
+            obj_id = ObjectId(user_id)
+            key = str(obj_id)
+            if key in self._emails or key in seen:
+                continue
+            seen.add(key)
+            missing.append(obj_id)
+
+        for start in range(0, len(missing), self.chunk_size):
+            chunk = missing[start:start + self.chunk_size]
+            self.query_count += 1
+            async for user in users_collection.find({"_id": {"$in": chunk}}, {"email": 1}):
+                self._emails[str(user["_id"])] = user.get("email", UNKNOWN_EMAIL)
+
+        # Memoize misses too so unknown ids are not queried again
+        for obj_id in missing:
+            self._emails.setdefault(str(obj_id), UNKNOWN_EMAIL)
+
+        return {user_id: self.get(user_id) for user_id in user_ids}
+
+    async def load(self, user_id: str) -> str:
+        return (await self.load_many([user_id]))[user_id]
+
+    def get(self, user_id: str) -> str:
+        if ObjectId.is_valid(user_id):
+            return self._emails.get(str(ObjectId(user_id)), UNKNOWN_EMAIL)
+        return UNKNOWN_EMAIL
@@ -29,6 +29,11 @@ export class EventDetailsComponent implements OnInit {
   canJoin = false; // User can join if not already a participant
   currentUserStatus: string | null = null;
   currentUserId: string | null = null;
+  // Shown participants: the page embedded in the event, then pages of GET /{event_id}/participants
+  participants: EventParticipant[] = [];
+  participantsCursor: string | null = null;
+  hasMoreParticipants = false;
+  isLoadingParticipants = false;
 
   constructor() {
     this.inviteForm = this.fb.group({
@@ -69,11 +74,11 @@ export class EventDetailsComponent implements OnInit {
         this.isLoading = false;
         
         this.isOrganizer = this.event?.organizer_id === this.currentUserId;
-        this.isParticipant = this.event?.participants.some(
-          (participant) => participant.user_id === this.currentUserId
-        ) ?? false;
+        // my_role covers participants beyond the embedded first page
+        this.isParticipant = this.event?.my_role != null;
         this.canJoin = !this.isParticipant && !this.isOrganizer;
-        this.currentUserStatus = this.getParticipantStatus();
+        this.currentUserStatus = this.event?.my_status ?? null;
+        this.resetParticipants();
         
         console.log('Event state:', {
           isOrganizer: this.isOrganizer,
@@ -90,13 +95,32 @@ export class EventDetailsComponent implements OnInit {
     });
   }
 
-  getParticipantStatus(): string {
-    if (!this.event || !this.currentUserId) return '';
-    
-    const participant = this.event.participants.find(
-      (p) => p.user_id === this.currentUserId
-    );
-    return participant?.status || '';
+  private resetParticipants(): void {
+    this.participants = this.event?.participants ?? [];
+    this.participantsCursor = null;
+    this.hasMoreParticipants = (this.event?.participant_count ?? 0) > this.participants.length;
+  }
+
+  loadMoreParticipants(): void {
+    const eventId = this.event?.id || this.event?._id;
+    if (!eventId || !this.hasMoreParticipants) return;
+
+    this.isLoadingParticipants = true;
+    this.eventService.getParticipants(eventId, this.participantsCursor).subscribe({
+      next: (response) => {
+        // The first page overlaps the embedded participants
+        const shown = new Set(this.participants.map((p) => p.user_id));
+        this.participants = [...this.participants, ...response.participants.filter((p) => !shown.has(p.user_id))];
+        this.participantsCursor = response.next_cursor ?? null;
+        this.hasMoreParticipants = !!this.participantsCursor;
+        this.isLoadingParticipants = false;
+      },
+      error: (error) => {
+        console.error('Error loading participants:', error);
+        this.error = error || 'Failed to load more participants.';
+        this.isLoadingParticipants = false;
+      }
+    });
   }
 
   getParticipantByEmail(email: string): EventParticipant | undefined {
@@ -124,6 +148,7 @@ export class EventDetailsComponent implements OnInit {
         next: (response) => {
           // Update the event with the new participant
           this.event = response.event;
+          this.resetParticipants();
           this.inviteForm.reset();
           this.success = 'User invited successfully!';
         },
@@ -159,9 +184,10 @@ export class EventDetailsComponent implements OnInit {
         console.log('Join event response:', response);
         // Update the event and user status
         this.event = response.event;
+        this.resetParticipants();
         this.isParticipant = true;
         this.canJoin = false;
-        this.currentUserStatus = this.getParticipantStatus();
+        this.currentUserStatus = null;
         this.success = 'Successfully joined the event! You can now set your attendance status.';
       },
       error: (error) => {
@@ -182,6 +208,7 @@ export class EventDetailsComponent implements OnInit {
         next: (response) => {
           // Update the event with the new status
           this.event = response.event;
+          this.resetParticipants();
           this.currentUserStatus = status;
           this.success = `Response updated to "${status}"!`;
         },
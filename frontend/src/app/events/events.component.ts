@@ -1,7 +1,7 @@
 import { Component, inject, OnInit } from '@angular/core';
 import { CommonModule } from '@angular/common';
 import { RouterModule } from '@angular/router';
-import { EventService, Event, EventParticipant } from '../services/event.service';
+import { EventService, EventSummary } from '../services/event.service';
 import { AuthService } from '../services/auth.service';
 
 @Component({
@@ -15,8 +15,12 @@ export class EventsComponent implements OnInit {
   private eventService = inject(EventService);
   private authService = inject(AuthService);
   
-  organizedEvents: Event[] = [];
-  invitedEvents: Event[] = [];
+  organizedEvents: EventSummary[] = [];
+  invitedEvents: EventSummary[] = [];
+  // next_cursor of the last page loaded, null once everything is shown
+  organizedCursor: string | null = null;
+  invitedCursor: string | null = null;
+  isLoadingMore = false;
   currentUserId: string | null = null;
   isLoading = false;
   error: string | null = null;
@@ -39,6 +43,7 @@ export class EventsComponent implements OnInit {
           ...event,
           id: event.id || event._id
         }));
+        this.organizedCursor = response.next_cursor ?? null;
         console.log('Organized events loaded:', this.organizedEvents.map(e => ({ id: e.id, title: e.title })));
         this.isLoading = false;
       },
@@ -56,6 +61,7 @@ export class EventsComponent implements OnInit {
           ...event,
           id: event.id || event._id
         }));
+        this.invitedCursor = response.next_cursor ?? null;
         console.log('Invited events loaded:', this.invitedEvents.map(e => ({ id: e.id, title: e.title })));
       },
       error: (error) => {
@@ -67,6 +73,44 @@ export class EventsComponent implements OnInit {
     });
   }
 
+  loadMoreOrganized(): void {
+    if (!this.organizedCursor) {
+      return;
+    }
+    this.isLoadingMore = true;
+    this.eventService.getOrganizedEvents(this.organizedCursor).subscribe({
+      next: (response) => {
+        this.organizedEvents = [...this.organizedEvents, ...(response.events || [])];
+        this.organizedCursor = response.next_cursor ?? null;
+        this.isLoadingMore = false;
+      },
+      error: (error) => {
+        console.error('Error loading more organized events:', error);
+        this.error = error || 'Failed to load more organized events';
+        this.isLoadingMore = false;
+      }
+    });
+  }
+
+  loadMoreInvited(): void {
+    if (!this.invitedCursor) {
+      return;
+    }
+    this.isLoadingMore = true;
+    this.eventService.getInvitedEvents(this.invitedCursor).subscribe({
+      next: (response) => {
+        this.invitedEvents = [...this.invitedEvents, ...(response.events || [])];
+        this.invitedCursor = response.next_cursor ?? null;
+        this.isLoadingMore = false;
+      },
+      error: (error) => {
+        console.error('Error loading more invited events:', error);
+        this.error = error || 'Failed to load more invited events';
+        this.isLoadingMore = false;
+      }
+    });
+  }
+
   onDeleteEvent(eventId: string | undefined): void {
     const idToDelete = eventId;
     console.log('Attempting to delete event with ID:', idToDelete);
@@ -96,13 +140,8 @@ export class EventsComponent implements OnInit {
     }
   }
 
-  getEventStatus(participants: EventParticipant[] = []): string {
-    if (!participants || participants.length === 0 || !this.currentUserId) {
-      return 'No response';
-    }
-
-    const participant = participants.find((p) => p.user_id === this.currentUserId);
-    return participant?.status || 'No response';
+  getEventStatus(event: EventSummary): string {
+    return event.my_status || 'No response';
   }
   
   refreshEvents(): void {
@@ -2,7 +2,7 @@ import { Component, inject, OnInit } from '@angular/core';
 import { CommonModule } from '@angular/common';
 import { RouterModule } from '@angular/router';
 import { FormBuilder, FormGroup, ReactiveFormsModule } from '@angular/forms';
-import { EventService, Event, SearchRequest } from '../../services/event.service';
+import { EventService, EventSummary, SearchRequest } from '../../services/event.service';
 
 @Component({
   selector: 'app-search-events',
@@ -16,7 +16,11 @@ export class SearchEventsComponent implements OnInit {
   private eventService = inject(EventService);
 
   searchForm: FormGroup;
-  events: Event[] = [];
+  events: EventSummary[] = [];
+  nextCursor: string | null = null;
+  // Filters of the last search, reused with the cursor to load more results
+  private lastRequest: SearchRequest = {};
+  isLoadingMore = false;
   isLoading = false;
   error: string | null = null;
   success: string | null = null;
@@ -60,8 +64,10 @@ export class SearchEventsComponent implements OnInit {
       searchRequest.role = formValue.role;
     }
 
+    this.lastRequest = searchRequest;
     this.eventService.searchEvents(searchRequest).subscribe({
       next: (response) => {
+        this.nextCursor = response.next_cursor ?? null;
         this.events = response.events || [];
         // Ensure all events have normalized IDs (normalization is handled by EventService)
         this.events = this.events.map(event => ({
@@ -71,7 +77,9 @@ export class SearchEventsComponent implements OnInit {
         console.log('Search results:', this.events.map(e => ({ id: e.id, title: e.title })));
         this.isLoading = false;
         this.hasSearched = true;
-        this.success = `Found ${this.events.length} events matching your criteria.`;
+        this.success = this.nextCursor
+          ? `Showing the first ${this.events.length} events matching your criteria.`
+          : `Found ${this.events.length} events matching your criteria.`;
       },
       error: (error) => {
         console.error('Error searching events:', error);
@@ -82,10 +90,30 @@ export class SearchEventsComponent implements OnInit {
     });
   }
 
+  loadMore(): void {
+    if (!this.nextCursor) {
+      return;
+    }
+    this.isLoadingMore = true;
+    this.eventService.searchEvents({ ...this.lastRequest, cursor: this.nextCursor }).subscribe({
+      next: (response) => {
+        this.events = [...this.events, ...(response.events || [])];
+        this.nextCursor = response.next_cursor ?? null;
+        this.isLoadingMore = false;
+      },
+      error: (error) => {
+        console.error('Error loading more events:', error);
+        this.error = error || 'Failed to load more events. Please try again.';
+        this.isLoadingMore = false;
+      }
+    });
+  }
+
   onReset(): void {
     this.searchForm.reset();
     this.hasSearched = false;
     this.events = [];
+    this.nextCursor = null;
     this.error = null;
     this.success = null;
   }
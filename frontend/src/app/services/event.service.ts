@@ -1,5 +1,5 @@
 import { Injectable, inject } from '@angular/core';
-import { HttpClient, HttpHeaders, HttpErrorResponse } from '@angular/common/http';
+import { HttpClient, HttpHeaders, HttpErrorResponse, HttpParams } from '@angular/common/http';
 import { Observable, throwError } from 'rxjs';
 import { catchError, tap, map } from 'rxjs/operators';
 import { AuthService } from './auth.service';
@@ -20,6 +20,29 @@ export interface Event {
   location: string;
   organizer_id: string;
   participants: EventParticipant[];
+  participant_count?: number | null;  // Set when the backend only sends the first page of participants
+  my_role?: string | null;  // Current user's role from GET /{event_id}, null if not a participant
+  my_status?: string | null;  // Current user's RSVP status from GET /{event_id}
+}
+
+// List endpoints (/organized, /invited, /search) return summaries;
+// the full Event with participants comes from GET /{event_id}
+export interface EventSummary {
+  id?: string;
+  _id?: string;
+  title: string;
+  date: string;  // ISO format
+  location: string;
+  organizer_id: string;
+  participant_count: number;
+  my_role?: string | null;  // Current user's role, null if not a participant
+  my_status?: string | null;  // Current user's RSVP status
+  status_counts?: Record<string, number> | null;  // going, maybe, not_going, pending, other
+}
+
+export interface ParticipantsResponse {
+  participants: EventParticipant[];
+  next_cursor?: string | null;
 }
 
 export interface CreateEventRequest {
@@ -42,10 +65,27 @@ export interface SearchRequest {
   start_date?: string;  // ISO format
   end_date?: string;    // ISO format
   role?: string;        // "organizer" or "attendee"
+  facets?: boolean;     // Also return counts over every match
+  limit?: number;       // Page size, the backend default when omitted
+  cursor?: string;      // next_cursor of the previous page
 }
 
-interface EventsResponse {
-  events: Event[];
+export interface FacetBucket {
+  value: string | null;
+  count: number;
+}
+
+export interface SearchFacets {
+  by_month: FacetBucket[];     // "YYYY-MM"
+  by_role: FacetBucket[];      // "organizer", "attendee" or "none"
+  by_location: FacetBucket[];
+  by_status: FacetBucket[];    // going, maybe, not_going, pending, other
+}
+
+export interface EventsResponse {
+  events: EventSummary[];
+  next_cursor?: string | null;  // Pass back to load the next page, null on the last one
+  facets?: SearchFacets;  // Only when requested from /search
 }
 
 @Injectable({
@@ -75,17 +115,37 @@ export class EventService {
     };
   }
 
+  private normalizeSummary(rawEvent: any): EventSummary {
+    const normalizedId = rawEvent.id || rawEvent._id;
+    if (!normalizedId) {
+      console.warn('Received event without id-like field', rawEvent);
+    }
+
+    return {
+      ...rawEvent,
+      id: normalizedId,
+      _id: normalizedId,
+      participant_count: rawEvent.participant_count ?? 0
+    };
+  }
+
   private normalizeEventsResponse(response: any): EventsResponse {
     const eventsPayload = Array.isArray(response?.events) ? response.events : [];
     return {
-      events: eventsPayload.map((event: any) => this.normalizeEvent(event))
+      events: eventsPayload.map((event: any) => this.normalizeSummary(event)),
+      next_cursor: response?.next_cursor ?? null,
+      facets: response?.facets
     };
   }
 
   private normalizeSingleEventResponse(response: any): { event: Event } {
-    return {
-      event: this.normalizeEvent(response?.event ?? response)
-    };
+    const event = this.normalizeEvent(response?.event ?? response);
+    // GET /{event_id} sends the caller's own entry next to the event
+    if (response?.my_role !== undefined) {
+      event.my_role = response.my_role;
+      event.my_status = response.my_status;
+    }
+    return { event };
   }
 
   private getAuthHeaders(): HttpHeaders {
@@ -133,9 +193,13 @@ export class EventService {
       );
   }
 
-  getOrganizedEvents(): Observable<EventsResponse> {
+  private pageParams(cursor?: string | null): HttpParams {
+    return cursor ? new HttpParams().set('cursor', cursor) : new HttpParams();
+  }
+
+  getOrganizedEvents(cursor?: string | null): Observable<EventsResponse> {
     console.log('Fetching organized events');
-    return this.http.get<EventsResponse>(`${this.apiUrl}/organized`, { headers: this.getAuthHeaders() })
+    return this.http.get<EventsResponse>(`${this.apiUrl}/organized`, { headers: this.getAuthHeaders(), params: this.pageParams(cursor) })
       .pipe(
         map(response => this.normalizeEventsResponse(response)),
         tap(response => {
@@ -149,9 +213,9 @@ export class EventService {
       );
   }
 
-  getInvitedEvents(): Observable<EventsResponse> {
+  getInvitedEvents(cursor?: string | null): Observable<EventsResponse> {
     console.log('Fetching invited events');
-    return this.http.get<EventsResponse>(`${this.apiUrl}/invited`, { headers: this.getAuthHeaders() })
+    return this.http.get<EventsResponse>(`${this.apiUrl}/invited`, { headers: this.getAuthHeaders(), params: this.pageParams(cursor) })
       .pipe(
         map(response => this.normalizeEventsResponse(response)),
         tap(response => {
@@ -175,6 +239,17 @@ export class EventService {
       );
   }
 
+  getParticipants(eventId: string, cursor?: string | null): Observable<ParticipantsResponse> {
+    console.log('Fetching participants of event:', eventId);
+    return this.http.get<ParticipantsResponse>(`${this.apiUrl}/${eventId}/participants`, {
+      headers: this.getAuthHeaders(), params: this.pageParams(cursor)
+    })
+      .pipe(
+        map(response => ({ participants: response?.participants ?? [], next_cursor: response?.next_cursor ?? null })),
+        catchError(this.handleError.bind(this))
+      );
+  }
+
   deleteEvent(eventId: string): Observable<any> {
     console.log('Deleting event:', eventId);
     if (!eventId) {
@@ -218,7 +293,7 @@ export class EventService {
       );
   }
 
-  searchEvents(searchParams: SearchRequest): Observable<any> {
+  searchEvents(searchParams: SearchRequest): Observable<EventsResponse> {
     console.log('Searching events:', searchParams);
     return this.http.post(`${this.apiUrl}/search`, searchParams, { headers: this.getAuthHeaders() })
       .pipe(